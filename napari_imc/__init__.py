@@ -1,9 +1,19 @@
-from ._reader import napari_get_reader
-from .imc_widget import IMCWidget
-
 try:
     from ._version import version as __version__
 except ImportError:
     __version__ = "unknown"
 
 __all__ = ["IMCWidget", "napari_get_reader"]
+
+
+def __getattr__(name: str):
+    # napari/Qt are only imported when needed, e.g. not for headless export
+    if name == "IMCWidget":
+        from .imc_widget import IMCWidget
+
+        return IMCWidget
+    if name == "napari_get_reader":
+        from ._reader import napari_get_reader
+
+        return napari_get_reader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -20,8 +20,7 @@ def reader_function(path):
     if viewer is not None:
         imc_widget = _get_imc_widget(viewer)
         paths = [path] if not isinstance(path, list) else path
-        for path in paths:
-            imc_file = imc_widget.controller.open_imc_file(path)
+        for imc_file in imc_widget.controller.open_imc_files(paths):
             if imc_file is not None:
                 for panorama in imc_file.panoramas:
                     if panorama.image_type == "Imported":
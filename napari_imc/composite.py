@@ -0,0 +1,80 @@
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import numpy as np
+from napari.layers import Image
+
+if TYPE_CHECKING:
+    from .models import ChannelModel
+
+
+class AcquisitionComposite:
+    def __init__(self, height: int, width: int) -> None:
+        self._rgb = np.zeros((height, width, 3), dtype=np.float32)
+        self._channel_data: Dict["ChannelModel", np.ndarray] = {}
+        self._channel_images: Dict["ChannelModel", np.ndarray] = {}
+        self._channel_colors: Dict["ChannelModel", np.ndarray] = {}
+        self._channel_image_params: Dict["ChannelModel", Tuple[float, ...]] = {}
+        self.layer: Optional[Image] = None
+
+    def add_channel(self, channel: "ChannelModel", data: np.ndarray):
+        self.remove_channel(channel, refresh=False)
+        self._channel_data[channel] = np.asarray(data, dtype=np.float32)
+        self.update_channel(channel)
+
+    def update_channel(self, channel: "ChannelModel", refresh: bool = True):
+        # channel contributions are blended additively; only the changed
+        # channel's contribution is recomputed and replaced
+        data = self._channel_data.get(channel)
+        if data is None:
+            return
+        image = self._channel_images.get(channel)
+        old_color = self._channel_colors.get(channel)
+        color = np.multiply(channel.color[:3], channel.color[3] * channel.opacity)
+        image_params = (*(channel.contrast_limits or (0.0, 1.0)), channel.gamma)
+        if image is None or image_params != self._channel_image_params[channel]:
+            if image is not None:
+                self._rgb -= image[:, :, np.newaxis] * old_color
+            image = self._create_channel_image(data, *image_params)
+            self._rgb += image[:, :, np.newaxis] * color
+            self._channel_images[channel] = image
+            self._channel_image_params[channel] = image_params
+        elif not np.array_equal(color, old_color):
+            self._rgb += image[:, :, np.newaxis] * (color - old_color)
+        self._channel_colors[channel] = color
+        if refresh:
+            self.refresh()
+
+    def remove_channel(self, channel: "ChannelModel", refresh: bool = True):
+        self._channel_data.pop(channel, None)
+        image = self._channel_images.pop(channel, None)
+        color = self._channel_colors.pop(channel, None)
+        self._channel_image_params.pop(channel, None)
+        if len(self._channel_data) == 0:
+            self._rgb[:] = 0
+        elif image is not None:
+            self._rgb -= image[:, :, np.newaxis] * color
+        if refresh:
+            self.refresh()
+
+    def refresh(self):
+        if self.layer is not None:
+            self.layer.data = self.rgb
+
+    @property
+    def rgb(self) -> np.ndarray:
+        return np.clip(self._rgb, 0.0, 1.0)
+
+    @property
+    def channels(self) -> Tuple["ChannelModel", ...]:
+        return tuple(self._channel_data.keys())
+
+    @staticmethod
+    def _create_channel_image(
+        data: np.ndarray, contrast_min: float, contrast_max: float, gamma: float
+    ) -> np.ndarray:
+        image = data - contrast_min
+        image /= max(contrast_max - contrast_min, np.finfo(np.float32).eps)
+        np.clip(image, 0.0, 1.0, out=image)
+        if gamma != 1.0:
+            np.power(image, gamma, out=image)
+        return image
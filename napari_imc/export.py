@@ -0,0 +1,329 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+from pathlib import Path
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from .io import get_file_reader_registry
+from .io.base import FileReaderBase, ImageDimensions
+
+try:
+    import tifffile  # type: ignore
+except Exception:
+    tifffile = None
+
+try:
+    import zarr  # type: ignore
+except Exception:
+    zarr = None
+
+EXPORT_FORMATS = ("ome-tiff", "zarr", "npy")
+EXPORT_SUFFIXES = {"ome-tiff": ".ome.tiff", "zarr": ".zarr", "npy": ".npy"}
+
+
+class ExportResult(NamedTuple):
+    path: Path
+    num_images: int
+    nbytes: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def export_imc_files(
+    paths: Sequence[Union[str, Path]],
+    output_dir: Union[str, Path],
+    export_format: str = "ome-tiff",
+    panoramas: bool = True,
+    acquisitions: bool = True,
+    max_workers: Optional[int] = None,
+    output_names: Optional[Sequence[Union[str, Path]]] = None,
+    overwrite: bool = False,
+) -> Iterator[ExportResult]:
+    if output_names is None:
+        output_names = [Path(path).stem for path in paths]
+    output_names = [Path(output_name) for output_name in output_names]
+    if len(set(output_names)) != len(output_names):
+        raise ValueError("Output names of the exported files are not unique")
+    # files are exported in parallel, results are yielded as they complete
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                export_imc_file,
+                path,
+                output_dir,
+                export_format=export_format,
+                panoramas=panoramas,
+                acquisitions=acquisitions,
+                output_name=output_name,
+                overwrite=overwrite,
+            ): Path(path)
+            for path, output_name in zip(paths, output_names)
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield ExportResult(futures[future], 0, 0, 0.0, error=str(e))
+
+
+def export_imc_file(
+    path: Union[str, Path],
+    output_dir: Union[str, Path],
+    export_format: str = "ome-tiff",
+    panoramas: bool = True,
+    acquisitions: bool = True,
+    output_name: Optional[Union[str, Path]] = None,
+    overwrite: bool = False,
+) -> ExportResult:
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    if export_format == "ome-tiff" and tifffile is None:
+        raise RuntimeError("The tifffile package is required for OME-TIFF export")
+    if export_format == "zarr" and zarr is None:
+        raise RuntimeError("The zarr package is required for Zarr export")
+    start = time.perf_counter()
+    path = Path(path)
+    file_reader_type = get_file_reader_registry().find(path)
+    if file_reader_type is None:
+        raise IOError(f"Unsupported file: {path}")
+    output_path = Path(output_dir) / (output_name or path.stem)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    num_images = 0
+    nbytes = 0
+    # acquisitions are read and written a few channels at a time (no caching)
+    with file_reader_type(path, streaming=True) as f:
+        imc_file = f.get_imc_file(None)
+        if panoramas and f.has_capabilities(FileReaderBase.Capability.PANORAMAS):
+            for imc_file_panorama in imc_file.panoramas:
+                dims, img = f.read_panorama(imc_file_panorama.id)
+                img = np.asarray(img)
+                _write_image(
+                    _get_output_path(
+                        output_path,
+                        f"_P{imc_file_panorama.id:02d}",
+                        export_format,
+                        overwrite,
+                    ),
+                    export_format,
+                    dims,
+                    [img],
+                    img.shape,
+                    img.dtype,
+                    "YXS" if img.ndim == 3 else "YX",
+                )
+                num_images += 1
+                nbytes += img.nbytes
+        if acquisitions:
+            for imc_file_acquisition in imc_file.acquisitions:
+                channels = f.iter_acquisition_channels(imc_file_acquisition.id)
+                first_channel = next(channels, None)
+                if first_channel is None:
+                    continue
+                _, dims, img = first_channel
+                shape = (len(imc_file_acquisition.channel_labels), *img.shape)
+                dtype = np.asarray(img).dtype
+                _write_image(
+                    _get_output_path(
+                        output_path,
+                        f"_A{imc_file_acquisition.id:02d}",
+                        export_format,
+                        overwrite,
+                    ),
+                    export_format,
+                    dims,
+                    (
+                        np.asarray(channel_img)
+                        for _, _, channel_img in chain([first_channel], channels)
+                    ),
+                    shape,
+                    dtype,
+                    "CYX",
+                    channel_labels=imc_file_acquisition.channel_labels,
+                )
+                num_images += 1
+                nbytes += int(np.prod(shape)) * dtype.itemsize
+    return ExportResult(path, num_images, nbytes, time.perf_counter() - start)
+
+
+def _get_output_path(
+    output_path: Path, name_suffix: str, export_format: str, overwrite: bool
+) -> Path:
+    output_path = output_path.with_name(output_path.name + name_suffix)
+    file_path = output_path.with_name(output_path.name + EXPORT_SUFFIXES[export_format])
+    if not overwrite and file_path.exists():
+        raise FileExistsError(f"Output already exists: {output_path}")
+    return output_path
+
+
+def _write_image(
+    output_path: Path,
+    export_format: str,
+    dims: ImageDimensions,
+    imgs: Iterable[np.ndarray],
+    shape: Tuple[int, ...],
+    dtype: np.dtype,
+    axes: str,
+    channel_labels: Optional[Sequence[str]] = None,
+):
+    # imgs are the channels of CYX images, or a single image otherwise
+    if dims.flip_y or dims.flip_x:
+        imgs = (_flip_image(img, dims) for img in imgs)
+    y_axis = axes.index("Y")
+    physical_size_x = dims.width / shape[y_axis + 1]
+    physical_size_y = dims.height / shape[y_axis]
+    file_path = output_path.with_name(output_path.name + EXPORT_SUFFIXES[export_format])
+    if export_format == "ome-tiff":
+        metadata = {
+            "axes": axes,
+            "PhysicalSizeX": physical_size_x,
+            "PhysicalSizeXUnit": "µm",
+            "PhysicalSizeY": physical_size_y,
+            "PhysicalSizeYUnit": "µm",
+        }
+        if channel_labels is not None:
+            metadata["Channel"] = {"Name": list(channel_labels)}
+        tifffile.imwrite(
+            file_path,
+            data=iter(imgs) if axes.startswith("C") else next(iter(imgs)),
+            shape=shape,
+            dtype=dtype,
+            photometric="rgb" if "S" in axes else "minisblack",
+            metadata=metadata,
+        )
+        return
+    # flips have been applied to the data already
+    attrs = {
+        "axes": axes,
+        "dims": [float(x) for x in dims._replace(flip_y=False, flip_x=False)],
+        "channel_labels": list(channel_labels or []),
+    }
+    if export_format == "zarr":
+        out = zarr.open_array(
+            str(file_path),
+            mode="w",
+            shape=shape,
+            dtype=dtype,
+            chunks=(1, 512, 512) if axes.startswith("C") else True,
+        )
+        out.attrs.update(attrs)
+    elif export_format == "npy":
+        out = np.lib.format.open_memmap(file_path, mode="w+", dtype=dtype, shape=shape)
+        with output_path.with_name(output_path.name + ".json").open("w") as f:
+            json.dump(attrs, f)
+    if axes.startswith("C"):
+        for i, img in enumerate(imgs):
+            out[i] = img
+    else:
+        out[...] = next(iter(imgs))
+    if export_format == "npy":
+        out.flush()
+
+
+def _flip_image(img: np.ndarray, dims: ImageDimensions) -> np.ndarray:
+    if dims.flip_y:
+        img = np.flip(img, axis=0)
+    if dims.flip_x:
+        img = np.flip(img, axis=1)
+    return img
+
+
+def _find_imc_files(paths: Sequence[Path]) -> List[Tuple[Path, Path]]:
+    # output names mirror the locations of the files relative to the given
+    # directories, so that files with the same name do not overwrite each other
+    imc_files = []
+    for path in paths:
+        if path.is_dir() and get_file_reader_registry().find(path) is None:
+            imc_files += [
+                (p, p.relative_to(path).with_suffix("")) for p in _iter_imc_files(path)
+            ]
+        else:
+            imc_files.append((path, Path(path.stem)))
+    return imc_files
+
+
+def _iter_imc_files(directory: Path) -> Iterator[Path]:
+    # all formats of the registered file readers are exported, including
+    # directories (e.g. IMAXT), which are not searched any further
+    for path in sorted(directory.iterdir()):
+        if get_file_reader_registry().find(path) is not None:
+            yield path
+        elif path.is_dir():
+            yield from _iter_imc_files(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="napari-imc-export",
+        description="Export panoramas and acquisitions of IMC files",
+    )
+    parser.add_argument("paths", nargs="+", type=Path, help="files or directories")
+    parser.add_argument("-o", "--output-dir", type=Path, required=True)
+    parser.add_argument(
+        "-f", "--format", choices=EXPORT_FORMATS, default=EXPORT_FORMATS[0]
+    )
+    parser.add_argument("--no-panoramas", action="store_true")
+    parser.add_argument("--no-acquisitions", action="store_true")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    parser.add_argument("--overwrite", action="store_true")
+    args = parser.parse_args(argv)
+    imc_files = _find_imc_files(args.paths)
+    output_names = [output_name for _, output_name in imc_files]
+    duplicate_output_names = {
+        output_name
+        for output_name in output_names
+        if output_names.count(output_name) > 1
+    }
+    if duplicate_output_names:
+        parser.error(
+            "files would be exported to the same location: "
+            + ", ".join(sorted(str(p) for p in duplicate_output_names))
+        )
+    start = time.perf_counter()
+    num_images = 0
+    nbytes = 0
+    num_errors = 0
+    for result in export_imc_files(
+        [path for path, _ in imc_files],
+        args.output_dir,
+        export_format=args.format,
+        panoramas=not args.no_panoramas,
+        acquisitions=not args.no_acquisitions,
+        max_workers=args.jobs,
+        output_names=output_names,
+        overwrite=args.overwrite,
+    ):
+        if result.error is not None:
+            print(f"{result.path}: {result.error}", file=sys.stderr)
+            num_errors += 1
+        else:
+            print(
+                f"{result.path}: {result.num_images} images, "
+                f"{result.nbytes / 1024**2:.1f} MiB in {result.seconds:.1f} s "
+                f"({result.nbytes / 1024**2 / max(result.seconds, 1e-6):.1f} MiB/s)"
+            )
+            num_images += result.num_images
+            nbytes += result.nbytes
+    seconds = time.perf_counter() - start
+    print(
+        f"Exported {num_images} images, {nbytes / 1024**2:.1f} MiB in {seconds:.1f} s "
+        f"({nbytes / 1024**2 / max(seconds, 1e-6):.1f} MiB/s), {num_errors} errors"
+    )
+    return 1 if num_errors > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
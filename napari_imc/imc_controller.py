@@ -1,12 +1,44 @@
+from bisect import bisect_left, insort
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Type, Union
+from stat import S_ISDIR
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Deque,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 from napari import Viewer
-from napari.layers import Image
+from napari.layers import Image, Layer
+from napari.qt.threading import GeneratorWorker, thread_worker
+from napari.utils.transforms import Affine
+from qtpy.QtCore import QTimer
 
-from .io import McdFileReader, TxtFileReader
-from .io.base import FileReaderBase
+from .composite import AcquisitionComposite
+from .io import get_file_reader_registry
+from .io.base import FileReaderBase, ImageDimensions
+from .io.cache import ImageCache
+from .io.metadata_index import MetadataIndex
+from .io.pool import FileReaderPool
+from .io.statistics import ChannelStatistics
+from .io.zarr_cache import ZarrCache
+from .memory import MemoryBudget
 from .models import (
     ChannelModel,
     IMCFileAcquisitionModel,
@@ -22,11 +54,19 @@ if TYPE_CHECKING:
 class IMCController(IMCFileTreeItem):
     PANORAMA_LAYER_TYPE = "imc_panorama_layer"
     ACQUISITION_LAYER_TYPE = "imc_acquisition_layer"
-    FILE_READERS: List[Type[FileReaderBase]] = [
-        # ImaxtFileReader,
-        McdFileReader,
-        TxtFileReader,
-    ]
+    MAX_OPEN_FILE_READERS = 8
+    FILE_READER_IDLE_TIMEOUT = 300.0
+    IMAGE_CACHE_MAX_BYTES = 2 * 1024**3
+    MAX_READ_WORKERS: Optional[int] = None
+    LAZY_ACQUISITIONS = False
+    STREAM_ACQUISITION_CHANNELS = False
+    MEMMAP_ACQUISITIONS = False
+    ZARR_CACHE_DIR: Optional[Union[str, Path]] = None
+    METADATA_INDEX_PATH: Optional[Union[str, Path]] = None
+    DEFAULT_CONTRAST_PERCENTILE = 99.9
+    COMPOSITE_ACQUISITIONS = False
+    MEMORY_BUDGET_MAX_BYTES = 4 * 1024**3
+    MAX_CLOSED_IMC_FILES = 16
 
     def __init__(self, viewer: Viewer, widget: "IMCWidget") -> None:
         super(IMCController, self).__init__()
@@ -34,33 +74,107 @@ class IMCController(IMCFileTreeItem):
         self._widget: "IMCWidget" = widget
         self._imc_files: List[IMCFileModel] = []
         self._channels: List[ChannelModel] = []
+        self._channels_by_label: Dict[str, ChannelModel] = {}
         self._selected_channels: List[ChannelModel] = []
-        self._closed_imc_files_qt_memory_hack: List[IMCFileModel] = []
+        self._closed_imc_files_qt_memory_hack: Deque[IMCFileModel] = deque(
+            maxlen=self.MAX_CLOSED_IMC_FILES
+        )
+        self._workers: Dict[Hashable, List[GeneratorWorker]] = {}
+        self._acquisition_composites: Dict[
+            IMCFileAcquisitionModel, AcquisitionComposite
+        ] = {}
+        # sorted positions of panorama/acquisition layers, None if invalidated
+        self._layer_indices: Optional[Dict[str, List[int]]] = None
+        self._layer_moved = False
+        self._memory_budget = MemoryBudget(max_bytes=self.MEMORY_BUDGET_MAX_BYTES)
+        # evicted layers, with the functions for reading their data again
+        self._evicted_layers: Dict[Layer, Tuple[Hashable, Callable[[], Any]]] = {}
+        self._read_executor = ThreadPoolExecutor(
+            max_workers=self.MAX_READ_WORKERS, thread_name_prefix="napari-imc"
+        )
+        self._file_reader_pool = FileReaderPool(
+            max_size=self.MAX_OPEN_FILE_READERS,
+            idle_timeout=self.FILE_READER_IDLE_TIMEOUT,
+        )
+        # idle file readers are also closed when no files are being read
+        self._file_reader_idle_timer = QTimer(self._widget)
+        self._file_reader_idle_timer.timeout.connect(self._file_reader_pool.close_idle)
+        if self.FILE_READER_IDLE_TIMEOUT is not None:
+            self._file_reader_idle_timer.start(
+                int(self.FILE_READER_IDLE_TIMEOUT * 1000)
+            )
+        self._image_cache = ImageCache(
+            max_bytes=self.IMAGE_CACHE_MAX_BYTES, memory_budget=self._memory_budget
+        )
+        self._zarr_cache: Optional[ZarrCache] = None
+        if self.ZARR_CACHE_DIR is not None:
+            self._zarr_cache = ZarrCache(self.ZARR_CACHE_DIR)
+        self._zarr_cache_queue: Deque[IMCFileModel] = deque()
+        self._zarr_cache_worker: Optional[GeneratorWorker] = None
+        self._metadata_index: Optional[MetadataIndex] = None
+        if self.METADATA_INDEX_PATH is not None:
+            self._metadata_index = MetadataIndex(self.METADATA_INDEX_PATH)
+        self._file_reader_kwargs = {
+            "image_cache": self._image_cache,
+            "zarr_cache": self._zarr_cache,
+            "metadata_index": self._metadata_index,
+            "lazy": self.LAZY_ACQUISITIONS,
+            "streaming": self.STREAM_ACQUISITION_CHANNELS,
+            "memmap": self.MEMMAP_ACQUISITIONS,
+        }
+        self._viewer.layers.events.inserted.connect(self._on_layer_inserted)
+        self._viewer.layers.events.removed.connect(self._on_layer_removed)
+        self._viewer.layers.events.moved.connect(self._on_layer_moved)
+        self._viewer.layers.events.reordered.connect(self._on_layers_reordered)
+        self._viewer.layers.events.changed.connect(self._on_layers_changed)
 
     @classmethod
     def is_imc_file(cls, path: Union[str, Path]) -> bool:
-        return any(file_reader.accepts(path) for file_reader in cls.FILE_READERS)
+        return cls._get_file_reader_type(path) is not None
 
     def open_imc_file(self, imc_file_path: Union[str, Path]) -> Optional[IMCFileModel]:
-        imc_file_path = Path(imc_file_path).resolve()
-        for imc_file in self.imc_files:
-            if imc_file.path.samefile(imc_file_path):
-                return imc_file
-        imc_file = None
-        for file_reader in self.FILE_READERS:
-            if file_reader.accepts(imc_file_path):
-                try:
-                    with file_reader(imc_file_path) as f:
-                        imc_file = f.get_imc_file(self)
-                except Exception:
-                    pass  # ignored intentionally
-        if imc_file is None:
-            return None
-        with self._widget.imc_file_tree_model.append_imc_file():
-            self._imc_files.append(imc_file)
-        return imc_file
+        return self.open_imc_files([imc_file_path])[0]
+
+    def open_imc_files(
+        self, imc_file_paths: Sequence[Union[str, Path]]
+    ) -> List[Optional[IMCFileModel]]:
+        imc_file_paths = [Path(p).resolve() for p in imc_file_paths]
+        imc_files: Dict[Path, Optional[IMCFileModel]] = {}
+        for imc_file_path in imc_file_paths:
+            imc_files[imc_file_path] = next(
+                (f for f in self.imc_files if f.path.samefile(imc_file_path)), None
+            )
+        # file metadata is parsed concurrently, the results are added at once
+        futures = {
+            imc_file_path: self._read_executor.submit(
+                self._read_imc_file, imc_file_path
+            )
+            for imc_file_path, imc_file in imc_files.items()
+            if imc_file is None
+        }
+        new_imc_files: List[IMCFileModel] = []
+        for imc_file_path, future in futures.items():
+            result = future.result()
+            if result is not None:
+                imc_file, file_reader = result
+                self._file_reader_pool.add(imc_file, file_reader)
+                imc_files[imc_file_path] = imc_file
+                new_imc_files.append(imc_file)
+        if len(new_imc_files) > 0:
+            imc_file_tree_model = self._widget.imc_file_tree_model
+            with imc_file_tree_model.append_imc_files(len(new_imc_files)):
+                self._imc_files += new_imc_files
+        if self._zarr_cache is not None:
+            self._zarr_cache_queue.extend(
+                imc_file
+                for imc_file in new_imc_files
+                if not self._zarr_cache.contains(imc_file.path)
+            )
+            self._write_zarr_cache()
+        return [imc_files[imc_file_path] for imc_file_path in imc_file_paths]
 
     def close_imc_file(self, imc_file: IMCFileModel):
+        self._quit_workers(imc_file)
         for imc_file_panorama in imc_file.panoramas:
             if imc_file_panorama.is_shown:
                 self.hide_imc_file_panorama(imc_file_panorama)
@@ -72,60 +186,79 @@ class IMCController(IMCFileTreeItem):
             imc_file.mark_deleted()
             self._imc_files.remove(imc_file)
             self._closed_imc_files_qt_memory_hack.append(imc_file)
+        # the file reader may still be in use, so it is closed in the background
+        self._read_executor.submit(self._close_file_reader, imc_file)
+
+    def close(self):
+        # called when the widget (and with it the idle timer) is destroyed
+        self._zarr_cache_queue.clear()
+        for item in list(self._workers.keys()):
+            self._quit_workers(item)
+        self._viewer.layers.events.inserted.disconnect(self._on_layer_inserted)
+        self._viewer.layers.events.removed.disconnect(self._on_layer_removed)
+        self._viewer.layers.events.moved.disconnect(self._on_layer_moved)
+        self._viewer.layers.events.reordered.disconnect(self._on_layers_reordered)
+        self._viewer.layers.events.changed.disconnect(self._on_layers_changed)
+        for layer in self._viewer.layers:
+            layer.events.visible.disconnect(self._on_layer_visible_changed)
+        for imc_file in self._imc_files:
+            imc_file.mark_deleted()
+        self._read_executor.shutdown(wait=True, cancel_futures=True)
+        self._file_reader_pool.close_all()
+        self._image_cache.clear()
+        if self._metadata_index is not None:
+            self._metadata_index.close()
 
     def show_imc_file_panorama(
         self, imc_file_panorama: IMCFilePanoramaModel
-    ) -> Optional[Image]:
-        dims, data = None, None
-        for file_reader in self.FILE_READERS:
-            if file_reader.accepts(imc_file_panorama.imc_file.path):
-                try:
-                    with file_reader(imc_file_panorama.imc_file.path) as f:
-                        dims, data = f.read_panorama(imc_file_panorama.id)
-                except Exception:
-                    pass  # ignored intentionally
-        if dims is None or data is None:
-            return None
-        new_layer_index = self._get_next_panorama_layer_index()
-        layer = self._viewer.add_image(
-            data,
-            name=(
-                f"{imc_file_panorama.imc_file.path.name} "
-                f"[P{imc_file_panorama.id:02d}]"
-            ),
-            metadata={
-                self.PANORAMA_LAYER_TYPE: True,
-                "imc_file_panorama": str(imc_file_panorama),
-            },
-            scale=(dims.height / data.shape[0], dims.width / data.shape[1]),
-            translate=(dims.y, dims.x),
-            rotate=dims.rotation,
-            opacity=0.5,
-        )
-        old_layer_index = self.viewer.layers.index(layer)
-        self.viewer.layers.move(old_layer_index, new_layer_index)
-        imc_file_panorama.set_shown(layer)
-        return layer
+    ) -> GeneratorWorker:
+        imc_file_panorama.set_shown()
+
+        @thread_worker
+        def read_panorama():
+            yield self._read_imc_file_panorama(imc_file_panorama)
+
+        worker = read_panorama()
+
+        @worker.yielded.connect
+        def on_worker_yielded(result):
+            if (
+                not worker.abort_requested
+                and imc_file_panorama.is_shown
+                and imc_file_panorama.shown_layer is None
+            ):
+                if result is not None:
+                    dims, levels = result
+                    layer = self._add_imc_file_panorama_layer(
+                        imc_file_panorama, dims, levels
+                    )
+                    imc_file_panorama.set_shown(layer)
+                else:  # panoramas that cannot be read are unchecked again
+                    imc_file_panorama.set_hidden()
+                    self._widget.refresh_imc_file_tree_view()
+
+        self._start_worker(imc_file_panorama, worker)
+        return worker
 
     def hide_imc_file_panorama(self, imc_file_panorama: IMCFilePanoramaModel):
+        self._quit_workers(imc_file_panorama)
         if imc_file_panorama.shown_layer in self._viewer.layers:
             self._viewer.layers.remove(imc_file_panorama.shown_layer)
         imc_file_panorama.set_hidden()
 
     def load_imc_file_acquisition(
         self, imc_file_acquisition: IMCFileAcquisitionModel
-    ) -> List[Image]:
+    ) -> GeneratorWorker:
         channels: List[ChannelModel] = []
         channels_to_show: List[ChannelModel] = []
         channels_to_append: List[ChannelModel] = []
         for channel_label in imc_file_acquisition.channel_labels:
-            channel = next(
-                (c for c in self._channels if c.label == channel_label), None
-            )
+            channel = self._channels_by_label.get(channel_label)
             if channel is None:
                 channel = ChannelModel(channel_label)
+                self._channels_by_label[channel_label] = channel
                 channels_to_append.append(channel)
-            channel.loaded_imc_file_acquisitions.append(imc_file_acquisition)
+            channel.add_loaded_imc_file_acquisition(imc_file_acquisition)
             if channel.is_shown:
                 channels_to_show.append(channel)
             channels.append(channel)
@@ -135,73 +268,303 @@ class IMCController(IMCFileTreeItem):
                 len(channels_to_append)
             ):
                 self._channels += channels_to_append
-        layers = []
-        for channel in channels_to_show[::-1]:
-            layer = self._show_imc_file_acquisition_channel(
-                imc_file_acquisition, channel
-            )
-            if layer is not None:
-                channel.shown_imc_file_acquisition_layers[imc_file_acquisition] = layer
-                layers.append(layer)
-        return layers
+        worker = self._show_imc_file_acquisition_channels(
+            [(imc_file_acquisition, channel) for channel in channels_to_show[::-1]]
+        )
+        self._start_worker(imc_file_acquisition, worker)
+        return worker
 
     def unload_imc_file_acquisition(
         self, imc_file_acquisition: IMCFileAcquisitionModel
     ):
+        self._quit_workers(imc_file_acquisition)
+        channels_to_remove: List[ChannelModel] = []
         for channel_label in imc_file_acquisition.channel_labels:
-            channel_index, channel = next(
-                (i, c) for i, c in enumerate(self._channels) if c.label == channel_label
-            )
+            channel = self._channels_by_label[channel_label]
             if channel.is_shown:
                 self._hide_imc_file_acquisition_channel(imc_file_acquisition, channel)
-            channel.loaded_imc_file_acquisitions.remove(imc_file_acquisition)
+            channel.remove_loaded_imc_file_acquisition(imc_file_acquisition)
             if len(channel.loaded_imc_file_acquisitions) == 0:
+                del self._channels_by_label[channel_label]
+                channels_to_remove.append(channel)
+        if len(channels_to_remove) > 0:
+            channel_indices = {c: i for i, c in enumerate(self._channels)}
+            for channel_index in sorted(
+                (channel_indices[c] for c in channels_to_remove), reverse=True
+            ):
                 with self._widget.channel_table_model.remove_channel(channel_index):
-                    self._channels.remove(channel)
+                    del self._channels[channel_index]
         imc_file_acquisition.set_unloaded()
 
-    def show_channel(self, channel: ChannelModel) -> List[Image]:
-        imc_file_acquisition_layers = {}
-        for imc_file_acquisition in channel.loaded_imc_file_acquisitions[::-1]:
-            layer = self._show_imc_file_acquisition_channel(
-                imc_file_acquisition, channel
-            )
-            if layer is not None:
-                imc_file_acquisition_layers[imc_file_acquisition] = layer
-        channel.set_shown(imc_file_acquisition_layers)
+    def show_channel(self, channel: ChannelModel) -> GeneratorWorker:
+        channel.set_shown({})
+        worker = self._show_imc_file_acquisition_channels(
+            [
+                (imc_file_acquisition, channel)
+                for imc_file_acquisition in reversed(
+                    channel.loaded_imc_file_acquisitions
+                )
+            ]
+        )
+        self._start_worker(channel, worker)
         self._widget.select_channel(self._channels.index(channel))
-        return list(imc_file_acquisition_layers.values())
+        return worker
 
     def hide_channel(self, channel: ChannelModel):
+        self._quit_workers(channel)
         for imc_file_acquisition in channel.loaded_imc_file_acquisitions:
             self._hide_imc_file_acquisition_channel(imc_file_acquisition, channel)
         channel.set_hidden()
         self._widget.select_channel(self._channels.index(channel))
 
-    def _show_imc_file_acquisition_channel(
-        self, imc_file_acquisition: IMCFileAcquisitionModel, channel: ChannelModel
-    ) -> Optional[Image]:
-        dims, data = None, None
-        for file_reader in self.FILE_READERS:
-            if file_reader.accepts(imc_file_acquisition.imc_file.path):
-                try:
-                    with file_reader(imc_file_acquisition.imc_file.path) as f:
-                        dims, data = f.read_acquisition(
-                            imc_file_acquisition.id, channel.label
+    def _show_imc_file_acquisition_channels(
+        self,
+        imc_file_acquisition_channels: Sequence[
+            Tuple[IMCFileAcquisitionModel, ChannelModel]
+        ],
+    ) -> GeneratorWorker:
+        @thread_worker
+        def read_imc_file_acquisition_channels():
+            # files are read in parallel, results are yielded in order; results
+            # are yielded (and shown) together for each acquisition
+            futures = [
+                self._read_executor.submit(
+                    self._read_imc_file_acquisition_channel,
+                    imc_file_acquisition,
+                    channel,
+                )
+                for imc_file_acquisition, channel in imc_file_acquisition_channels
+            ]
+            try:
+                start = 0
+                while start < len(futures):
+                    stop = start + 1
+                    while (
+                        stop < len(futures)
+                        and imc_file_acquisition_channels[stop][0]
+                        == imc_file_acquisition_channels[start][0]
+                    ):
+                        stop += 1
+                    yield [
+                        (imc_file_acquisition, channel, future.result())
+                        for (imc_file_acquisition, channel), future in zip(
+                            imc_file_acquisition_channels[start:stop],
+                            futures[start:stop],
+                        )
+                    ]
+                    start = stop
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        worker = read_imc_file_acquisition_channels()
+
+        @worker.yielded.connect
+        def on_worker_yielded(
+            values: List[
+                Tuple[
+                    IMCFileAcquisitionModel,
+                    ChannelModel,
+                    Optional[Tuple[ImageDimensions, np.ndarray, ChannelStatistics]],
+                ]
+            ],
+        ):
+            channel_layers: List[Tuple[ChannelModel, Image]] = []
+            for imc_file_acquisition, channel, result in values:
+                if (
+                    result is not None
+                    and not worker.abort_requested
+                    and imc_file_acquisition.is_loaded
+                    and channel.is_shown
+                    and not channel.is_imc_file_acquisition_shown(imc_file_acquisition)
+                ):
+                    dims, data, channel_statistics = result
+                    if self.COMPOSITE_ACQUISITIONS:
+                        composite = self._add_imc_file_acquisition_channel_composite(
+                            imc_file_acquisition,
+                            channel,
+                            dims,
+                            data,
+                            channel_statistics,
+                        )
+                        channel.shown_imc_file_acquisition_composites[
+                            imc_file_acquisition
+                        ] = composite
+                    else:
+                        layer = self._create_imc_file_acquisition_channel_layer(
+                            imc_file_acquisition,
+                            channel,
+                            dims,
+                            data,
+                            channel_statistics,
                         )
-                except Exception:
-                    pass  # ignored intentionally
-        if dims is None or data is None:
+                        channel_layers.append((channel, layer))
+            if len(channel_layers) > 0:
+                # all values are of the same acquisition
+                self._add_imc_file_acquisition_channel_layers(
+                    values[0][0], channel_layers
+                )
+
+        return worker
+
+    def _hide_imc_file_acquisition_channel(
+        self, imc_file_acquisition: IMCFileAcquisitionModel, channel: ChannelModel
+    ):
+        layer = channel.shown_imc_file_acquisition_layers.pop(
+            imc_file_acquisition, None
+        )
+        if layer is not None and layer in self._viewer.layers:
+            self._viewer.layers.remove(layer)
+        composite = channel.shown_imc_file_acquisition_composites.pop(
+            imc_file_acquisition, None
+        )
+        if composite is not None:
+            composite.remove_channel(channel)
+            if len(composite.channels) == 0:
+                del self._acquisition_composites[imc_file_acquisition]
+                if composite.layer in self._viewer.layers:
+                    self._viewer.layers.remove(composite.layer)
+
+    def _read_imc_file(
+        self, imc_file_path: Path
+    ) -> Optional[Tuple[IMCFileModel, FileReaderBase]]:
+        file_reader_type = self._get_file_reader_type(imc_file_path)
+        if file_reader_type is None:
             return None
-        if channel.contrast_limits is None:
-            channel.contrast_limits = (0, np.amax(data))
-        new_layer_index = self._get_next_acquisition_layer_index()
-        layer = self._viewer.add_image(
+        file_reader = file_reader_type(imc_file_path, **self._file_reader_kwargs)
+        try:
+            with ExitStack() as exit_stack:
+                exit_stack.enter_context(file_reader)
+                imc_file = file_reader.get_imc_file(self)
+                exit_stack.pop_all()  # keep the file open for subsequent reads
+        except Exception:
+            return None  # ignored intentionally
+        return imc_file, file_reader
+
+    def _read_imc_file_panorama(
+        self, imc_file_panorama: IMCFilePanoramaModel
+    ) -> Optional[Tuple[ImageDimensions, List[np.ndarray]]]:
+        try:
+            with self._open_file_reader(imc_file_panorama.imc_file) as f:
+                return f.read_panorama_pyramid(imc_file_panorama.id)
+        except Exception:
+            return None  # ignored intentionally
+
+    def _read_imc_file_acquisition_channel(
+        self, imc_file_acquisition: IMCFileAcquisitionModel, channel: ChannelModel
+    ) -> Optional[Tuple[ImageDimensions, np.ndarray, ChannelStatistics]]:
+        try:
+            with self._open_file_reader(imc_file_acquisition.imc_file) as f:
+                dims, data = f.read_acquisition(imc_file_acquisition.id, channel.label)
+                if imc_file_acquisition.channel_statistics is None:
+                    imc_file_acquisition.channel_statistics = (
+                        f.read_acquisition_statistics(imc_file_acquisition.id)
+                    )
+            return dims, data, imc_file_acquisition.channel_statistics[channel.label]
+        except Exception:
+            return None  # ignored intentionally
+
+    def _write_zarr_cache(self) -> Optional[GeneratorWorker]:
+        # files are converted one at a time by a single worker, so that
+        # conversions do not hold up reading images for display
+        if self._zarr_cache_worker is not None or len(self._zarr_cache_queue) == 0:
+            return None
+
+        @thread_worker
+        def write_zarr_cache():
+            while len(self._zarr_cache_queue) > 0:
+                imc_file = self._zarr_cache_queue.popleft()
+                if not imc_file.is_deleted:
+                    try:
+                        yield from self._write_imc_file_zarr_cache(imc_file)
+                    except Exception:
+                        pass  # ignored intentionally
+
+        worker = write_zarr_cache()
+        self._zarr_cache_worker = worker
+
+        @worker.finished.connect
+        def on_worker_finished():
+            if self._zarr_cache_worker is worker:
+                self._zarr_cache_worker = None
+                self._write_zarr_cache()  # files queued while finishing
+
+        self._start_worker(self._zarr_cache, worker)
+        return worker
+
+    def _write_imc_file_zarr_cache(self, imc_file: IMCFileModel) -> Iterator[None]:
+        # files are read by a separate file reader without image cache, so
+        # that conversions neither evict cached images nor lock pooled readers
+        file_reader = imc_file.file_reader_type(
+            imc_file.path, metadata_index=self._metadata_index, streaming=True
+        )
+        with self._zarr_cache.create(imc_file.path) as writer, file_reader as f:
+            for imc_file_panorama in imc_file.panoramas:
+                dims, levels = f.read_panorama_pyramid(imc_file_panorama.id)
+                writer.write_panorama_pyramid(imc_file_panorama.id, dims, levels)
+                yield
+            for imc_file_acquisition in imc_file.acquisitions:
+                channels = f.iter_acquisition_channels(imc_file_acquisition.id)
+                first_channel = next(channels, None)
+                if first_channel is not None:
+                    _, dims, _ = first_channel
+                    writer.write_acquisition_channels(
+                        imc_file_acquisition.id,
+                        dims,
+                        (img for _, _, img in chain([first_channel], channels)),
+                        len(imc_file_acquisition.channel_labels),
+                    )
+                yield
+
+    def _add_imc_file_panorama_layer(
+        self,
+        imc_file_panorama: IMCFilePanoramaModel,
+        dims: ImageDimensions,
+        levels: List[np.ndarray],
+    ) -> Image:
+        data = levels[0]
+        layer = Image(
+            levels if len(levels) > 1 else data,
+            multiscale=len(levels) > 1,
+            name=(
+                f"{imc_file_panorama.imc_file.path.name} "
+                f"[P{imc_file_panorama.id:02d}]"
+            ),
+            metadata={
+                self.PANORAMA_LAYER_TYPE: True,
+                "imc_file_panorama": str(imc_file_panorama),
+            },
+            **self._get_layer_transform(dims, data.shape),
+            opacity=0.5,
+        )
+        # inserted directly, rather than appended and moved
+        self._viewer.layers.insert(self._get_next_panorama_layer_index(), layer)
+        self._add_layer_to_memory_budget(
+            imc_file_panorama,
+            layer,
+            lambda: self._read_imc_file_panorama_layer_data(imc_file_panorama),
+        )
+        layer.events.visible.connect(self._on_layer_visible_changed)
+        self._enforce_memory_budget()
+        return layer
+
+    def _create_imc_file_acquisition_channel_layer(
+        self,
+        imc_file_acquisition: IMCFileAcquisitionModel,
+        channel: ChannelModel,
+        dims: ImageDimensions,
+        data: np.ndarray,
+        channel_statistics: ChannelStatistics,
+    ) -> Image:
+        self._set_default_contrast_limits(channel, channel_statistics)
+        layer = Image(
             data,
             colormap=channel.create_colormap(),
             gamma=channel.gamma,
             interpolation2d=channel.interpolation,
-            contrast_limits=(0, np.amax(data)),  # sets contrast_limits_range
+            contrast_limits=self._get_contrast_limits(  # sets contrast_limits_range
+                channel_statistics.min, channel_statistics.max
+            ),
             name=(
                 f"{imc_file_acquisition.imc_file.path.name} "
                 f"[A{imc_file_acquisition.id:02d} {channel.label}]"
@@ -211,52 +574,361 @@ class IMCController(IMCFileTreeItem):
                 "imc_file_acquisition": str(imc_file_acquisition),
                 "channel": str(channel),
             },
-            scale=(dims.height / data.shape[0], dims.width / data.shape[1]),
-            translate=(dims.y, dims.x),
-            rotate=dims.rotation,
+            **self._get_layer_transform(dims, data.shape),
             opacity=channel.opacity,
             blending=channel.blending,
         )
         layer.contrast_limits = channel.contrast_limits
-        old_layer_index = self.viewer.layers.index(layer)
-        self.viewer.layers.move(old_layer_index, new_layer_index)
         return layer
 
-    def _hide_imc_file_acquisition_channel(
-        self, imc_file_acquisition: IMCFileAcquisitionModel, channel: ChannelModel
+    def _add_imc_file_acquisition_channel_layers(
+        self,
+        imc_file_acquisition: IMCFileAcquisitionModel,
+        channel_layers: Sequence[Tuple[ChannelModel, Image]],
     ):
-        layer = channel.shown_imc_file_acquisition_layers.get(imc_file_acquisition)
-        if layer is not None and layer in self._viewer.layers:
-            self._viewer.layers.remove(layer)
+        self._insert_layers(
+            self._get_next_acquisition_layer_index(),
+            [layer for _, layer in channel_layers],
+        )
+        # layers are only recorded once they have been added
+        for channel, layer in channel_layers:
+            channel.shown_imc_file_acquisition_layers[imc_file_acquisition] = layer
+            self._add_layer_to_memory_budget(
+                imc_file_acquisition,
+                layer,
+                partial(
+                    self._read_imc_file_acquisition_channel_layer_data,
+                    imc_file_acquisition,
+                    channel,
+                ),
+            )
+            layer.events.visible.connect(self._on_layer_visible_changed)
+        self._enforce_memory_budget()
+
+    def _add_imc_file_acquisition_channel_composite(
+        self,
+        imc_file_acquisition: IMCFileAcquisitionModel,
+        channel: ChannelModel,
+        dims: ImageDimensions,
+        data: np.ndarray,
+        channel_statistics: ChannelStatistics,
+    ) -> AcquisitionComposite:
+        self._set_default_contrast_limits(channel, channel_statistics)
+        composite = self._acquisition_composites.get(imc_file_acquisition)
+        if composite is not None:
+            composite.add_channel(channel, data)
+            return composite
+        composite = AcquisitionComposite(*data.shape)
+        composite.add_channel(channel, data)
+        composite.layer = Image(
+            composite.rgb,
+            rgb=True,
+            contrast_limits=(0.0, 1.0),
+            name=(
+                f"{imc_file_acquisition.imc_file.path.name} "
+                f"[A{imc_file_acquisition.id:02d}]"
+            ),
+            metadata={
+                self.ACQUISITION_LAYER_TYPE: True,
+                "imc_file_acquisition": str(imc_file_acquisition),
+            },
+            **self._get_layer_transform(dims, data.shape),
+            blending="additive",
+        )
+        self._viewer.layers.insert(
+            self._get_next_acquisition_layer_index(), composite.layer
+        )
+        self._acquisition_composites[imc_file_acquisition] = composite
+        return composite
+
+    @staticmethod
+    def _get_layer_transform(
+        dims: ImageDimensions, shape: Tuple[int, ...]
+    ) -> Dict[str, Any]:
+        transform = Affine(
+            scale=(dims.height / shape[0], dims.width / shape[1]),
+            translate=(dims.y, dims.x),
+            rotate=dims.rotation,
+        )
+        # images are flipped through the layer transform rather than by
+        # copying data, so that layer data stays contiguous
+        flip = np.eye(3)
+        if dims.flip_y:
+            flip[0, 0] = -1.0
+            flip[0, 2] = shape[0] - 1
+        if dims.flip_x:
+            flip[1, 1] = -1.0
+            flip[1, 2] = shape[1] - 1
+        return {"affine": transform.affine_matrix @ flip}
+
+    def _add_layer_to_memory_budget(
+        self, item: Hashable, layer: Image, read: Callable[[], Any]
+    ):
+        def evict():
+            self._evicted_layers[layer] = (item, read)
+            layer.data = self._create_placeholder_data(layer.data)
+
+        # layer data is counted once with the cached images it is a view of
+        self._memory_budget.add(layer, layer.data, evict, evictable=not layer.visible)
+
+    def _reload_layer(self, layer: Image) -> GeneratorWorker:
+        item, read = self._evicted_layers[layer]
+
+        @thread_worker
+        def read_layer_data():
+            yield read()
 
-    def _get_layer_index(self, layer_type: str, last: bool = False):
-        layer_enumerator = enumerate(self.viewer.layers)
-        if last:
-            layer_enumerator = reversed(list(layer_enumerator))
-        for i, layer in layer_enumerator:
-            if layer.metadata.get(layer_type, False):
-                return i
+        worker = read_layer_data()
+
+        @worker.yielded.connect
+        def on_worker_yielded(data):
+            if (
+                data is not None
+                and not worker.abort_requested
+                and layer in self._evicted_layers
+                and layer in self._viewer.layers
+            ):
+                del self._evicted_layers[layer]
+                layer.data = data
+                self._add_layer_to_memory_budget(item, layer, read)
+                self._enforce_memory_budget()
+
+        self._start_worker(item, worker)
+        return worker
+
+    def _read_imc_file_panorama_layer_data(
+        self, imc_file_panorama: IMCFilePanoramaModel
+    ) -> Optional[Any]:
+        result = self._read_imc_file_panorama(imc_file_panorama)
+        if result is not None:
+            dims, levels = result
+            return levels if len(levels) > 1 else levels[0]
         return None
 
-    def _get_next_panorama_layer_index(self):
-        last_panorama_layer_index = self._get_layer_index(
-            self.PANORAMA_LAYER_TYPE, last=True
+    def _read_imc_file_acquisition_channel_layer_data(
+        self, imc_file_acquisition: IMCFileAcquisitionModel, channel: ChannelModel
+    ) -> Optional[np.ndarray]:
+        result = self._read_imc_file_acquisition_channel(imc_file_acquisition, channel)
+        if result is not None:
+            dims, data, channel_statistics = result
+            return data
+        return None
+
+    @staticmethod
+    def _create_placeholder_data(data):
+        # zero-strided arrays of the original shape, without allocating memory
+        if isinstance(data, np.ndarray):
+            return np.broadcast_to(np.zeros((), dtype=data.dtype), data.shape)
+        return [
+            np.broadcast_to(np.zeros((), dtype=img.dtype), img.shape) for img in data
+        ]
+
+    def _set_default_contrast_limits(
+        self, channel: ChannelModel, channel_statistics: ChannelStatistics
+    ):
+        if channel.contrast_limits is None:
+            min_value = channel_statistics.min
+            max_value = channel_statistics.get_percentile(
+                self.DEFAULT_CONTRAST_PERCENTILE
+            )
+            # sparse channels have percentiles at their minimum
+            if max_value <= min_value:
+                max_value = channel_statistics.max
+            channel.contrast_limits = self._get_contrast_limits(min_value, max_value)
+
+    @staticmethod
+    def _get_contrast_limits(min_value: float, max_value: float) -> Tuple[float, float]:
+        # contrast limits must be increasing, e.g. also for constant channels
+        if max_value <= min_value:
+            max_value = min_value + 1.0
+        return min_value, max_value
+
+    def _start_worker(self, item: Hashable, worker: GeneratorWorker):
+        self._workers.setdefault(item, []).append(worker)
+
+        @worker.finished.connect
+        def on_worker_finished():
+            workers = self._workers.get(item)
+            if workers is not None and worker in workers:
+                workers.remove(worker)
+                if len(workers) == 0:
+                    del self._workers[item]
+
+        worker.start()
+
+    def _quit_workers(self, item: Hashable):
+        for worker in self._workers.pop(item, []):
+            worker.quit()
+
+    def _close_file_reader(self, imc_file: IMCFileModel):
+        self._file_reader_pool.close(imc_file)
+        self._image_cache.invalidate(imc_file.path)
+
+    def _open_file_reader(
+        self, imc_file: IMCFileModel
+    ) -> ContextManager[FileReaderBase]:
+        if imc_file.is_deleted:
+            raise IOError(f"File has been closed: {imc_file.path}")
+        if imc_file.file_reader_type is None:
+            raise IOError(f"Unsupported file: {imc_file.path}")
+        return self._file_reader_pool.open(
+            imc_file, imc_file.file_reader_type, **self._file_reader_kwargs
         )
-        if last_panorama_layer_index is not None:
-            return last_panorama_layer_index + 1
-        first_acquisition_layer_index = self._get_layer_index(
-            self.ACQUISITION_LAYER_TYPE, last=False
+
+    @classmethod
+    def _get_file_reader_type(
+        cls, path: Union[str, Path]
+    ) -> Optional[Type[FileReaderBase]]:
+        path = Path(path).resolve()
+        try:
+            stat_result = path.stat()
+        except OSError:
+            return None
+        file_reader_registry = get_file_reader_registry()
+        # directories (e.g. IMAXT) are probed every time, as their contents may
+        # change without changing their size or modification time
+        if S_ISDIR(stat_result.st_mode):
+            return cls._probe_file_reader_type(path)
+        # format detection is memoized; modified files are probed again, as are
+        # all files after file readers have been registered or unregistered
+        return cls._find_file_reader_type(
+            path,
+            stat_result.st_size,
+            stat_result.st_mtime_ns,
+            file_reader_registry.version,
+        )
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _find_file_reader_type(
+        cls, path: Path, size: int, mtime_ns: int, file_reader_registry_version: int
+    ) -> Optional[Type[FileReaderBase]]:
+        return cls._probe_file_reader_type(path)
+
+    @classmethod
+    def _probe_file_reader_type(cls, path: Path) -> Optional[Type[FileReaderBase]]:
+        # file readers supporting the configured read paths are preferred
+        file_reader_registry = get_file_reader_registry()
+        file_reader_type = file_reader_registry.find(
+            path, capabilities=cls._get_file_reader_capabilities()
         )
-        if first_acquisition_layer_index is not None:
-            return max(0, first_acquisition_layer_index - 1)
+        if file_reader_type is None:
+            file_reader_type = file_reader_registry.find(path)
+        return file_reader_type
+
+    @classmethod
+    def _get_file_reader_capabilities(cls) -> FileReaderBase.Capability:
+        capabilities = FileReaderBase.Capability.NONE
+        if cls.LAZY_ACQUISITIONS:
+            capabilities |= FileReaderBase.Capability.LAZY
+        if cls.STREAM_ACQUISITION_CHANNELS:
+            capabilities |= (
+                FileReaderBase.Capability.CHUNKED
+                | FileReaderBase.Capability.CHANNEL_SUBSET
+            )
+        if cls.MEMMAP_ACQUISITIONS:
+            capabilities |= FileReaderBase.Capability.MEMMAP
+        return capabilities
+
+    def _on_layer_inserted(self, event):
+        self._insert_layer_indices(event.index, [event.value])
+
+    def _on_layer_removed(self, event):
+        self._remove_layer_index(event.index, event.value)
+        self._memory_budget.remove(event.value)
+        self._evicted_layers.pop(event.value, None)
+        self._widget.refresh_memory_usage()
+
+    def _on_layer_moved(self, event):
+        self._remove_layer_index(event.index, event.value)
+        self._insert_layer_indices(event.new_index, [event.value])
+        self._layer_moved = True
+
+    def _on_layers_reordered(self, event):
+        # moves are tracked incrementally, other reorderings are not
+        if not self._layer_moved:
+            self._layer_indices = None
+        self._layer_moved = False
+
+    def _on_layers_changed(self, event):
+        self._layer_indices = None
+
+    def _on_layer_visible_changed(self, event):
+        layer = event.source
+        if layer.visible and layer in self._evicted_layers:
+            self._reload_layer(layer)
+        else:
+            self._memory_budget.set_evictable(layer, not layer.visible)
+            self._enforce_memory_budget()
+
+    def _enforce_memory_budget(self):
+        # data is only evicted from the main thread, as layers are modified
+        self._memory_budget.enforce()
+        self._widget.refresh_memory_usage()
+
+    def _insert_layers(self, index: int, layers: Sequence[Layer]):
+        # layers are inserted in one pass, with scene graph updates paused and
+        # layer indices updated once for all inserted layers
+        layer_list = self._viewer.layers
+        with layer_list.batched_update(), layer_list.events.inserted.blocker(
+            self._on_layer_inserted
+        ):
+            for i, layer in enumerate(layers):
+                layer_list.insert(index + i, layer)
+        self._insert_layer_indices(index, layers)
+
+    def _insert_layer_indices(self, index: int, layers: Sequence[Layer]):
+        if self._layer_indices is not None:
+            for layer_indices in self._layer_indices.values():
+                for i in range(bisect_left(layer_indices, index), len(layer_indices)):
+                    layer_indices[i] += len(layers)
+            for i, layer in enumerate(layers):
+                layer_type = self._get_layer_type(layer)
+                if layer_type is not None:
+                    insort(self._layer_indices[layer_type], index + i)
+
+    def _remove_layer_index(self, index: int, layer: Layer):
+        if self._layer_indices is not None:
+            layer_type = self._get_layer_type(layer)
+            if layer_type is not None:
+                layer_indices = self._layer_indices[layer_type]
+                del layer_indices[bisect_left(layer_indices, index)]
+            for layer_indices in self._layer_indices.values():
+                for i in range(bisect_left(layer_indices, index), len(layer_indices)):
+                    layer_indices[i] -= 1
+
+    def _get_layer_indices(self, layer_type: str) -> List[int]:
+        if self._layer_indices is None:
+            self._layer_indices = {
+                self.PANORAMA_LAYER_TYPE: [],
+                self.ACQUISITION_LAYER_TYPE: [],
+            }
+            for i, layer in enumerate(self._viewer.layers):
+                layer_type_ = self._get_layer_type(layer)
+                if layer_type_ is not None:
+                    self._layer_indices[layer_type_].append(i)
+        return self._layer_indices[layer_type]
+
+    def _get_layer_type(self, layer: Layer) -> Optional[str]:
+        if layer.metadata.get(self.PANORAMA_LAYER_TYPE, False):
+            return self.PANORAMA_LAYER_TYPE
+        if layer.metadata.get(self.ACQUISITION_LAYER_TYPE, False):
+            return self.ACQUISITION_LAYER_TYPE
+        return None
+
+    def _get_next_panorama_layer_index(self):
+        panorama_layer_indices = self._get_layer_indices(self.PANORAMA_LAYER_TYPE)
+        if len(panorama_layer_indices) > 0:
+            return panorama_layer_indices[-1] + 1
+        acquisition_layer_indices = self._get_layer_indices(self.ACQUISITION_LAYER_TYPE)
+        if len(acquisition_layer_indices) > 0:
+            return max(0, acquisition_layer_indices[0] - 1)
         return len(self.viewer.layers)
 
     def _get_next_acquisition_layer_index(self):
-        last_acquisition_layer_index = self._get_layer_index(
-            self.ACQUISITION_LAYER_TYPE, last=True
-        )
-        if last_acquisition_layer_index is not None:
-            return last_acquisition_layer_index + 1
+        acquisition_layer_indices = self._get_layer_indices(self.ACQUISITION_LAYER_TYPE)
+        if len(acquisition_layer_indices) > 0:
+            return acquisition_layer_indices[-1] + 1
         return len(self.viewer.layers)
 
     @property
@@ -267,6 +939,10 @@ class IMCController(IMCFileTreeItem):
     def widget(self) -> "IMCWidget":
         return self._widget
 
+    @property
+    def memory_budget(self) -> MemoryBudget:
+        return self._memory_budget
+
     @property
     def imc_files(self) -> Tuple[IMCFileModel, ...]:
         return tuple(self._imc_files)
@@ -8,7 +8,14 @@ from qtpy.QtCore import (
     QSortFilterProxyModel,
     Qt,
 )
-from qtpy.QtWidgets import QSizePolicy, QSplitter, QStackedWidget, QVBoxLayout, QWidget
+from qtpy.QtWidgets import (
+    QLabel,
+    QSizePolicy,
+    QSplitter,
+    QStackedWidget,
+    QVBoxLayout,
+    QWidget,
+)
 
 from .imc_controller import IMCController
 from .models import IMCFileAcquisitionModel, IMCFileModel, IMCFilePanoramaModel
@@ -25,6 +32,7 @@ class IMCWidget(QWidget):
     def __init__(self, napari_viewer: Viewer, parent: Optional[QWidget] = None) -> None:
         super(IMCWidget, self).__init__(parent)
         self._controller = IMCController(napari_viewer, self)
+        self.destroyed.connect(self._controller.close)
 
         self._imc_file_tree_model = IMCFileTreeModel(self._controller, parent=self)
         self._imc_file_tree_view = IMCFileTreeView(parent=self)
@@ -47,6 +55,9 @@ class IMCWidget(QWidget):
         self._channel_controls_container.addWidget(QWidget(self))
         self._channel_controls_container.addWidget(self._channel_controls_widget)
 
+        self._memory_usage_label = QLabel(self)
+        self.refresh_memory_usage()
+
         layout = QVBoxLayout(self)
         splitter = QSplitter(Qt.Orientation.Vertical, self)
         splitter.addWidget(self._imc_file_tree_view)
@@ -57,6 +68,7 @@ class IMCWidget(QWidget):
         channel_panel.setLayout(channel_panel_layout)
         splitter.addWidget(channel_panel)
         layout.addWidget(splitter)
+        layout.addWidget(self._memory_usage_label)
         self.setLayout(layout)
 
         @self._imc_file_tree_model.dataChanged.connect
@@ -130,6 +142,16 @@ class IMCWidget(QWidget):
         else:
             self._channel_controls_container.setCurrentIndex(0)
 
+    def refresh_imc_file_tree_view(self):
+        self._imc_file_tree_view.viewport().update()
+
+    def refresh_memory_usage(self):
+        memory_budget = self._controller.memory_budget
+        self._memory_usage_label.setText(
+            f"Memory: {memory_budget.nbytes / 1024**2:.0f} MiB "
+            f"/ {memory_budget.max_bytes / 1024**2:.0f} MiB"
+        )
+
     @property
     def controller(self):
         return self._controller
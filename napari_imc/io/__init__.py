@@ -1,5 +1,12 @@
 from .imaxt import ImaxtFileReader
 from .mcd import McdFileReader
+from .registry import FileReaderRegistry, get_file_reader_registry
 from .txt import TxtFileReader
 
-__all__ = ["ImaxtFileReader", "McdFileReader", "TxtFileReader"]
+__all__ = [
+    "FileReaderRegistry",
+    "ImaxtFileReader",
+    "McdFileReader",
+    "TxtFileReader",
+    "get_file_reader_registry",
+]
@@ -1,11 +1,35 @@
 from abc import abstractmethod
+from enum import Flag, auto
 from pathlib import Path
-from typing import List, NamedTuple, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import numpy as np
 
 from ..models import IMCFileAcquisitionModel, IMCFileModel, IMCFilePanoramaModel
 from ..models.base import IMCFileTreeItem
+from .cache import ImageCache
+from .metadata_index import MetadataIndex
+from .pyramid import create_image_pyramid
+from .statistics import (
+    ChannelStatistics,
+    compute_channel_statistics,
+    dump_channel_statistics,
+    load_channel_statistics,
+)
+
+if TYPE_CHECKING:
+    from .zarr_cache import ZarrCache
 
 
 class ImageDimensions(NamedTuple):
@@ -14,23 +38,92 @@ class ImageDimensions(NamedTuple):
     width: float
     height: float
     rotation: float = 0.0
+    # image orientation; flips are applied by the viewer, not to the data
+    flip_y: bool = False  # image rows are stored bottom to top
+    flip_x: bool = False  # image columns are stored right to left
 
 
 class FileReaderBase:
-    def __init__(self, path: Union[str, Path]) -> None:
+    class Capability(Flag):
+        NONE = 0
+        PANORAMAS = auto()  # implements read_panorama
+        LAZY = auto()  # implements _read_acquisition_stack_lazy
+        CHUNKED = auto()  # reads acquisitions in chunks with bounded memory
+        THREAD_SAFE = auto()  # can be used by multiple threads at once
+        CHANNEL_SUBSET = auto()  # implements _read_acquisition_channels
+        MEMMAP = auto()  # implements _read_acquisition_stack_memmap
+
+    CAPABILITIES = Capability.NONE
+    PANORAMA_PYRAMID_MIN_SIZE = 1024
+    ACQUISITION_CHANNEL_BATCH_SIZE = 4
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        image_cache: Optional[ImageCache] = None,
+        zarr_cache: Optional["ZarrCache"] = None,
+        metadata_index: Optional[MetadataIndex] = None,
+        lazy: bool = False,
+        streaming: bool = False,
+        memmap: bool = False,
+    ) -> None:
         self._path = Path(path)
+        self._image_cache = image_cache
+        self._zarr_cache = zarr_cache
+        self._metadata_index = metadata_index
+        # read paths are only used if supported by the file reader
+        self._lazy = lazy and self.has_capabilities(FileReaderBase.Capability.LAZY)
+        self._streaming = streaming and self.has_capabilities(
+            FileReaderBase.Capability.CHUNKED | FileReaderBase.Capability.CHANNEL_SUBSET
+        )
+        self._memmap = memmap and self.has_capabilities(
+            FileReaderBase.Capability.MEMMAP
+        )
+        self._acquisition_channel_indices: Dict[int, Dict[str, int]] = {}
 
     def get_imc_file(self, imc_file_tree_root_item: IMCFileTreeItem) -> IMCFileModel:
-        imc_file = IMCFileModel(self._path, imc_file_tree_root_item)
-        imc_file.panoramas.extend(self._get_imc_file_panoramas(imc_file))
-        imc_file.acquisitions.extend(self._get_imc_file_acquisitions(imc_file))
+        imc_file = IMCFileModel(
+            self._path, imc_file_tree_root_item, file_reader_type=type(self)
+        )
+        metadata = None
+        if self._metadata_index is not None:
+            metadata = self._metadata_index.get(self._path)
+        if metadata is not None:
+            self._load_metadata(metadata)
+            imc_file.panoramas.extend(
+                IMCFilePanoramaModel(imc_file, *panorama)
+                for panorama in metadata["panoramas"]
+            )
+            imc_file.acquisitions.extend(
+                IMCFileAcquisitionModel(imc_file, *acquisition)
+                for acquisition in metadata["acquisitions"]
+            )
+        else:
+            imc_file.panoramas.extend(self._get_imc_file_panoramas(imc_file))
+            imc_file.acquisitions.extend(self._get_imc_file_acquisitions(imc_file))
+            if self._metadata_index is not None:
+                self._metadata_index.put(self._path, self._dump_metadata(imc_file))
         return imc_file
 
-    @abstractmethod
+    def _dump_metadata(self, imc_file: IMCFileModel) -> Dict[str, Any]:
+        return {
+            "panoramas": [
+                [panorama.id, panorama.image_type, panorama.description]
+                for panorama in imc_file.panoramas
+            ],
+            "acquisitions": [
+                [acquisition.id, acquisition.description, acquisition.channel_labels]
+                for acquisition in imc_file.acquisitions
+            ],
+        }
+
+    def _load_metadata(self, metadata: Dict[str, Any]):
+        pass
+
     def _get_imc_file_panoramas(
         self, imc_file: IMCFileModel
     ) -> List[IMCFilePanoramaModel]:
-        pass
+        return []  # not supported by default
 
     @abstractmethod
     def _get_imc_file_acquisitions(
@@ -38,14 +131,198 @@ class FileReaderBase:
     ) -> List[IMCFileAcquisitionModel]:
         pass
 
-    @abstractmethod
     def read_panorama(self, panorama_id: int) -> Tuple[ImageDimensions, np.ndarray]:
-        pass
+        raise RuntimeError("This operation is not supported")
+
+    def read_panorama_pyramid(
+        self, panorama_id: int
+    ) -> Tuple[ImageDimensions, List[np.ndarray]]:
+        if self._zarr_cache is not None:
+            result = self._zarr_cache.read_panorama_pyramid(self._path, panorama_id)
+            if result is not None:
+                return result
+
+        if self._image_cache is None:
+            return self._read_panorama_pyramid(panorama_id)
+        return self._image_cache.get_or_read(
+            self._path,
+            ("panorama", panorama_id),
+            lambda: self._read_panorama_pyramid(panorama_id),
+        )
+
+    def _read_panorama_pyramid(
+        self, panorama_id: int
+    ) -> Tuple[ImageDimensions, List[np.ndarray]]:
+        dims, img = self.read_panorama(panorama_id)
+        return dims, create_image_pyramid(img, self.PANORAMA_PYRAMID_MIN_SIZE)
 
-    @abstractmethod
     def read_acquisition(
         self, acquisition_id: int, channel_label: str
     ) -> Tuple[ImageDimensions, np.ndarray]:
+        channel_index = self._get_acquisition_channel_index(
+            acquisition_id, channel_label
+        )
+        # when streaming, the full stack is only used if it is readily available
+        if self._streaming:
+            result = self._find_acquisition_stack(acquisition_id)
+            if result is None:
+                dims, img = self._read_acquisition_channels(
+                    acquisition_id, [channel_index]
+                )
+                return dims, img[0]
+        else:
+            result = self.read_acquisition_stack(acquisition_id)
+        dims, img = result
+        return dims, img[channel_index]
+
+    def read_acquisition_channels(
+        self, acquisition_id: int, channel_labels: Sequence[str]
+    ) -> Tuple[ImageDimensions, np.ndarray]:
+        channel_indices = [
+            self._get_acquisition_channel_index(acquisition_id, channel_label)
+            for channel_label in channel_labels
+        ]
+        result = self._find_acquisition_stack(acquisition_id)
+        if result is not None:
+            dims, img = result
+            return dims, img[channel_indices]
+        return self._read_acquisition_channels(acquisition_id, channel_indices)
+
+    def iter_acquisition_channels(
+        self, acquisition_id: int, channel_labels: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[str, ImageDimensions, np.ndarray]]:
+        for batch_channel_labels, dims, img in self._iter_acquisition_channel_batches(
+            acquisition_id, channel_labels
+        ):
+            for channel_label, channel_img in zip(batch_channel_labels, img):
+                yield channel_label, dims, channel_img
+
+    def _iter_acquisition_channel_batches(
+        self, acquisition_id: int, channel_labels: Optional[Sequence[str]] = None
+    ) -> Iterator[Tuple[Sequence[str], ImageDimensions, np.ndarray]]:
+        if channel_labels is None:
+            channel_labels = self._get_acquisition_channel_labels(acquisition_id)
+        channel_indices = [
+            self._get_acquisition_channel_index(acquisition_id, channel_label)
+            for channel_label in channel_labels
+        ]
+        # when streaming, only a few channels are held in memory at once;
+        # otherwise, the stack is read (and cached) once and sliced. Lazy stacks
+        # are not used if channel subsets can be read, as lazily reading a
+        # channel may read the pixel records of all channels
+        result = self._find_acquisition_stack(acquisition_id, lazy=False)
+        if result is None and not (
+            self._streaming
+            or (
+                self._lazy
+                and self.has_capabilities(FileReaderBase.Capability.CHANNEL_SUBSET)
+            )
+        ):
+            result = self.read_acquisition_stack(acquisition_id)
+        for start in range(0, len(channel_labels), self.ACQUISITION_CHANNEL_BATCH_SIZE):
+            stop = start + self.ACQUISITION_CHANNEL_BATCH_SIZE
+            if result is not None:
+                dims, img = result
+                img = img[channel_indices[start:stop]]
+            else:
+                dims, img = self._read_acquisition_channels(
+                    acquisition_id, channel_indices[start:stop]
+                )
+            yield channel_labels[start:stop], dims, img
+
+    def read_acquisition_stack(
+        self, acquisition_id: int
+    ) -> Tuple[ImageDimensions, np.ndarray]:
+        result = self._find_acquisition_stack(acquisition_id)
+        if result is not None:
+            return result
+        if self._image_cache is None:
+            return self._read_acquisition_stack(acquisition_id)
+        return self._image_cache.get_or_read(
+            self._path,
+            ("acquisition", acquisition_id),
+            lambda: self._read_acquisition_stack(acquisition_id),
+        )
+
+    def read_acquisition_statistics(
+        self, acquisition_id: int
+    ) -> Dict[str, ChannelStatistics]:
+        statistics = None
+        if self._metadata_index is not None:
+            statistics = self._metadata_index.get_acquisition_statistics(
+                self._path, acquisition_id
+            )
+        if statistics is not None:
+            statistics = load_channel_statistics(statistics)
+        else:
+            statistics = []
+            for _, _, img in self._iter_acquisition_channel_batches(acquisition_id):
+                statistics += compute_channel_statistics(img)
+            if self._metadata_index is not None:
+                self._metadata_index.put_acquisition_statistics(
+                    self._path, acquisition_id, dump_channel_statistics(statistics)
+                )
+        channel_labels = self._get_acquisition_channel_labels(acquisition_id)
+        return dict(zip(channel_labels, statistics))
+
+    @abstractmethod
+    def _read_acquisition_stack(
+        self, acquisition_id: int
+    ) -> Tuple[ImageDimensions, np.ndarray]:
+        pass
+
+    def _find_acquisition_stack(
+        self, acquisition_id: int, lazy: bool = True
+    ) -> Optional[Tuple[ImageDimensions, np.ndarray]]:
+        # stacks that can be obtained without decoding the acquisition
+        if self._zarr_cache is not None:
+            result = self._zarr_cache.read_acquisition_stack(self._path, acquisition_id)
+            if result is not None:
+                return result
+        if self._memmap:
+            result = self._read_acquisition_stack_memmap(acquisition_id)
+            if result is not None:
+                return result
+        if self._lazy and lazy:
+            result = self._read_acquisition_stack_lazy(acquisition_id)
+            if result is not None:
+                return result
+        if self._image_cache is not None:
+            return self._image_cache.get(self._path, ("acquisition", acquisition_id))
+        return None
+
+    def _read_acquisition_channels(
+        self, acquisition_id: int, channel_indices: Sequence[int]
+    ) -> Tuple[ImageDimensions, np.ndarray]:
+        dims, img = self._read_acquisition_stack(acquisition_id)
+        return dims, img[channel_indices]
+
+    def _read_acquisition_stack_lazy(
+        self, acquisition_id: int
+    ) -> Optional[Tuple[ImageDimensions, np.ndarray]]:
+        return None  # not supported by default
+
+    def _read_acquisition_stack_memmap(
+        self, acquisition_id: int
+    ) -> Optional[Tuple[ImageDimensions, np.memmap]]:
+        return None  # not supported by default
+
+    def _get_acquisition_channel_index(
+        self, acquisition_id: int, channel_label: str
+    ) -> int:
+        channel_indices = self._acquisition_channel_indices.get(acquisition_id)
+        if channel_indices is None:
+            channel_indices = {
+                channel_label: i
+                for i, channel_label in enumerate(
+                    self._get_acquisition_channel_labels(acquisition_id)
+                )
+            }
+            self._acquisition_channel_indices[acquisition_id] = channel_indices
+        return channel_indices[channel_label]
+
+    @abstractmethod
+    def _get_acquisition_channel_labels(self, acquisition_id: int) -> Sequence[str]:
         pass
 
     @abstractmethod
@@ -59,3 +336,7 @@ class FileReaderBase:
     @classmethod
     def accepts(cls, path: Union[str, Path]) -> bool:
         return False
+
+    @classmethod
+    def has_capabilities(cls, capabilities: "FileReaderBase.Capability") -> bool:
+        return cls.CAPABILITIES & capabilities == capabilities
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import RLock
+from typing import TYPE_CHECKING, Callable, Hashable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..memory import MemoryBudget
+    from .base import ImageDimensions
+
+CacheEntry = Tuple["ImageDimensions", Union[np.ndarray, Sequence[np.ndarray]]]
+
+
+class ImageCache:
+    # cached images are evicted after the layers viewing them
+    MEMORY_BUDGET_PRIORITY = 1
+
+    def __init__(
+        self,
+        max_bytes: int = 2 * 1024**3,
+        memory_budget: Optional["MemoryBudget"] = None,
+    ) -> None:
+        self._max_bytes = max_bytes
+        # cached images are evicted when the memory budget is exceeded
+        self._memory_budget = memory_budget
+        self._entries: "OrderedDict[Tuple[Path, Hashable], CacheEntry]" = OrderedDict()
+        self._nbytes = 0
+        self._lock = RLock()
+
+    def get_or_read(
+        self, path: Path, key: Hashable, read: Callable[[], CacheEntry]
+    ) -> CacheEntry:
+        entry = self.get(path, key)
+        if entry is not None:
+            return entry
+        entry = read()
+        self.put(path, key, entry)
+        return entry
+
+    def get(self, path: Path, key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get((path, key))
+            if entry is not None:
+                self._entries.move_to_end((path, key))
+                if self._memory_budget is not None:
+                    self._memory_budget.touch(self._get_memory_budget_key(path, key))
+            return entry
+
+    def put(self, path: Path, key: Hashable, entry: CacheEntry):
+        nbytes = self._get_nbytes(entry)
+        if nbytes > self._max_bytes:
+            return
+        with self._lock:
+            self._remove((path, key))
+            self._entries[(path, key)] = entry
+            self._nbytes += nbytes
+            if self._memory_budget is not None:
+                self._memory_budget.add(
+                    self._get_memory_budget_key(path, key),
+                    entry[1],
+                    lambda: self._evict((path, key), entry),
+                    evictable=True,
+                    priority=self.MEMORY_BUDGET_PRIORITY,
+                )
+            while self._nbytes > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, path: Union[str, Path]):
+        path = Path(path)
+        with self._lock:
+            for entry_key in [k for k in self._entries.keys() if k[0] == path]:
+                self._remove(entry_key)
+
+    def clear(self):
+        with self._lock:
+            for entry_key in list(self._entries.keys()):
+                self._remove(entry_key)
+
+    def _evict(self, entry_key: Tuple[Path, Hashable], entry: CacheEntry):
+        # called by the memory budget (without holding its lock)
+        with self._lock:
+            if self._entries.get(entry_key) is entry:
+                self._remove(entry_key)
+
+    def _remove(self, entry_key: Tuple[Path, Hashable]):
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._nbytes -= self._get_nbytes(entry)
+            if self._memory_budget is not None:
+                self._memory_budget.remove(self._get_memory_budget_key(*entry_key))
+
+    def _get_memory_budget_key(self, path: Path, key: Hashable) -> Hashable:
+        return id(self), path, key
+
+    @staticmethod
+    def _get_nbytes(entry: CacheEntry) -> int:
+        if isinstance(entry[1], np.ndarray):
+            return entry[1].nbytes
+        return sum(img.nbytes for img in entry[1])
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
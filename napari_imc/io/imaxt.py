@@ -1,8 +1,7 @@
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
-from imageio import imread
 
 from ..io.base import FileReaderBase, ImageDimensions
 from ..models import IMCFileAcquisitionModel, IMCFileModel, IMCFilePanoramaModel
@@ -12,11 +11,31 @@ try:
 except Exception:
     zarr = None
 
+try:
+    import dask.array as da  # type: ignore
+except ImportError:
+    da = None
+
+try:
+    from imageio import imread  # type: ignore
+except Exception:
+    imread = None
+
 
 class ImaxtFileReader(FileReaderBase):
-    def __init__(self, path: Union[str, Path]) -> None:
-        super(ImaxtFileReader, self).__init__(self._get_zarr_path(path))
+    CAPABILITIES = (
+        FileReaderBase.Capability.PANORAMAS
+        | FileReaderBase.Capability.LAZY
+        | FileReaderBase.Capability.CHUNKED
+        | FileReaderBase.Capability.THREAD_SAFE
+    )
+
+    def __init__(self, path: Union[str, Path], **kwargs) -> None:
+        super(ImaxtFileReader, self).__init__(self._get_zarr_path(path), **kwargs)
         self._zarr_group: Optional["zarr.hierarchy.Group"] = None
+        self._panoramas: Dict[int, Dict[str, Any]] = {}
+        self._acquisitions: Dict[int, Dict[str, Any]] = {}
+        self._lazy = True  # acquisitions are already stored chunked on disk
 
     def _get_imc_file_panoramas(
         self, imc_file: IMCFileModel
@@ -25,7 +44,7 @@ class ImaxtFileReader(FileReaderBase):
             IMCFilePanoramaModel(
                 imc_file, panorama["id"], panorama["type"], panorama["description"]
             )
-            for panorama in self._zarr_group.attrs["meta"]["panoramas"]
+            for panorama in self._panoramas.values()
             if panorama["type"] != "Default"
         ]
 
@@ -39,46 +58,72 @@ class ImaxtFileReader(FileReaderBase):
                 acquisition["description"],
                 [channel["target"] for channel in acquisition["channels"]],
             )
-            for acquisition in self._zarr_group.attrs["meta"]["acquisitions"]
+            for acquisition in self._acquisitions.values()
         ]
 
     def read_panorama(self, panorama_id: int) -> Tuple[ImageDimensions, np.ndarray]:
-        # FIXME change to new ImageDimensions model
-        raise NotImplementedError()
-        panorama = next(
-            filter(
-                lambda x: x["id"] == panorama_id,
-                self._zarr_group.attrs["meta"]["panoramas"],
-            )
+        if imread is None:
+            raise RuntimeError("The imageio package is required to read panoramas")
+        panorama = self._panoramas[panorama_id]
+        img = imread(self._path / Path(panorama["file"]))
+        points_um = panorama["slide_pos_um"]
+        width_um = np.hypot(
+            points_um[1][0] - points_um[0][0], points_um[1][1] - points_um[0][1]
         )
-        data = imread(self._path / Path(panorama["file"]))
-        xs_physical = [x for x, y in panorama["slide_pos_um"]]
-        ys_physical = [y for x, y in panorama["slide_pos_um"]]
-        x_physical, y_physical = min(xs_physical), min(ys_physical)
-        w_physical, h_physical = (
-            max(xs_physical) - x_physical,
-            max(ys_physical) - y_physical,
+        height_um = np.hypot(
+            points_um[2][0] - points_um[1][0], points_um[2][1] - points_um[1][1]
+        )
+        rotation = -np.arctan2(
+            points_um[1][1] - points_um[0][1], points_um[1][0] - points_um[0][0]
         )
-        if x_physical != xs_physical[0]:
-            data = data[:, ::-1, :]
-        if y_physical != ys_physical[0]:
-            data = data[::-1, :, :]
-        return (x_physical, y_physical, w_physical, h_physical), data
-
-    def read_acquisition(
-        self, acquisition_id: int, channel_label: str
+        dims = ImageDimensions(
+            points_um[0][0],
+            points_um[0][1] - height_um,
+            width_um,
+            height_um,
+            rotation=rotation,
+            flip_y=True,
+        )
+        return dims, img
+
+    def _read_acquisition_stack(
+        self, acquisition_id: int
     ) -> Tuple[ImageDimensions, np.ndarray]:
-        # FIXME change to new ImageDimensions model
-        raise NotImplementedError()
-        acquisition = next(
-            filter(
-                lambda x: x["id"] == acquisition_id,
-                self._zarr_group.attrs["meta"]["acquisitions"],
-            )
+        acquisition = self._get_acquisition(acquisition_id)
+        img = self._get_acquisition_array(acquisition)
+        img = img.oindex[self._get_acquisition_channel_indices(acquisition)]
+        return self._get_acquisition_dimensions(acquisition), img
+
+    def _read_acquisition_stack_lazy(
+        self, acquisition_id: int
+    ) -> Optional[Tuple[ImageDimensions, "da.Array"]]:
+        if da is None:
+            return None
+        acquisition = self._get_acquisition(acquisition_id)
+        img = da.from_zarr(self._get_acquisition_array(acquisition))
+        channel_indices = self._get_acquisition_channel_indices(acquisition)
+        if channel_indices != list(range(img.shape[0])):
+            img = img[channel_indices]
+        return self._get_acquisition_dimensions(acquisition), img
+
+    def _get_acquisition_array(self, acquisition: Dict[str, Any]) -> "zarr.Array":
+        return self._zarr_group[acquisition["group"]][acquisition["group"]]
+
+    def _get_acquisition_channel_indices(
+        self, acquisition: Dict[str, Any]
+    ) -> List[int]:
+        # stored channels may be a reordered subset of the acquisition channels
+        stored_channel_indices = list(
+            self._zarr_group[acquisition["group"]]["channel"][:]
         )
-        channel_index = [
-            channel["target"] for channel in acquisition["channels"]
-        ].index(channel_label)
+        return [
+            stored_channel_indices.index(channel_index)
+            for channel_index in range(len(acquisition["channels"]))
+        ]
+
+    def _get_acquisition_dimensions(
+        self, acquisition: Dict[str, Any]
+    ) -> ImageDimensions:
         xs_physical = [
             acquisition["roi_start_pos_um"][0] / 1000,
             acquisition["roi_end_pos_um"][0],
@@ -88,33 +133,42 @@ class ImaxtFileReader(FileReaderBase):
             acquisition["roi_end_pos_um"][1],
         ]
         x_physical, y_physical = min(xs_physical), min(ys_physical)
-        w_physical, h_physical = (
+        return ImageDimensions(
+            x_physical,
+            y_physical,
             max(xs_physical) - x_physical,
             max(ys_physical) - y_physical,
+            flip_x=x_physical != xs_physical[0],
+            flip_y=y_physical != ys_physical[0],
         )
-        acquisition_group = self._zarr_group[acquisition["group"]]
-        channel_index = list(acquisition_group["channel"]).index(channel_index)
-        data = acquisition_group[acquisition["group"]][channel_index]
-        if x_physical != xs_physical[0]:
-            data = data[:, ::-1]
-        if y_physical != ys_physical[0]:
-            data = data[::-1, :]
-        return (x_physical, y_physical, w_physical, h_physical), data
+
+    def _get_acquisition_channel_labels(self, acquisition_id: int) -> Sequence[str]:
+        acquisition = self._get_acquisition(acquisition_id)
+        return [channel["target"] for channel in acquisition["channels"]]
+
+    def _get_acquisition(self, acquisition_id: int) -> Dict[str, Any]:
+        return self._acquisitions[acquisition_id]
 
     def __enter__(self) -> "FileReaderBase":
         self._zarr_group = zarr.open_group(str(self._path), mode="r")
+        meta = self._zarr_group.attrs["meta"]
+        self._panoramas = {panorama["id"]: panorama for panorama in meta["panoramas"]}
+        self._acquisitions = {
+            acquisition["id"]: acquisition for acquisition in meta["acquisitions"]
+        }
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        pass
+        self._zarr_group = None
+        self._panoramas.clear()
+        self._acquisitions.clear()
 
     @classmethod
     def accepts(cls, path: Union[str, Path]) -> bool:
-        if zarr:
+        zarr_path = cls._get_zarr_path(path)
+        if zarr and (zarr_path / ".zgroup").is_file():
             try:
-                with zarr.open_group(
-                    str(cls._get_zarr_path(path)), mode="r"
-                ) as zarr_group:
+                with zarr.open_group(str(zarr_path), mode="r") as zarr_group:
                     meta = zarr_group.attrs.get("meta")
                     if meta is not None:
                         return meta.get("scan_type") == "IMC"
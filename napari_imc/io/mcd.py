@@ -1,17 +1,58 @@
+import warnings
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from readimc import MCDFile
+from readimc.data import Acquisition, Panorama
 
 from ..io.base import FileReaderBase, ImageDimensions
 from ..models import IMCFileAcquisitionModel, IMCFileModel, IMCFilePanoramaModel
 
+try:
+    import dask.array as da  # type: ignore
+except ImportError:
+    da = None
+
 
 class McdFileReader(FileReaderBase):
-    def __init__(self, path: Union[str, Path]) -> None:
-        super(McdFileReader, self).__init__(path)
+    CAPABILITIES = (
+        FileReaderBase.Capability.PANORAMAS
+        | FileReaderBase.Capability.LAZY
+        | FileReaderBase.Capability.CHUNKED
+        | FileReaderBase.Capability.CHANNEL_SUBSET
+        | FileReaderBase.Capability.MEMMAP
+    )
+    LAZY_CHUNK_SIZE = 1024 * 1024  # pixels per chunk
+    READ_CHUNK_SIZE = 1024 * 1024  # pixels per pass
+
+    class AcquisitionInfo(NamedTuple):
+        dims: ImageDimensions
+        channel_labels: List[str]
+        data_offset: int
+        data_size: int
+        width: int
+        height: int
+        value_bytes: int
+
+    def __init__(self, path: Union[str, Path], **kwargs) -> None:
+        super(McdFileReader, self).__init__(path, **kwargs)
+        if self._lazy and da is None:
+            warnings.warn(
+                "Lazy acquisition reads require dask (napari-imc[lazy]), "
+                "acquisitions are read eagerly instead"
+            )
+            self._lazy = False
         self._mcd_file: Optional[MCDFile] = None
+        self._panoramas: Dict[int, Panorama] = {}
+        self._acquisitions: Dict[int, Acquisition] = {}
+        self._acquisition_infos: Dict[int, McdFileReader.AcquisitionInfo] = {}
+        # indexed acquisition infos are loaded up front, so that file readers
+        # (re)created after opening the file do not parse the schema either
+        if self._metadata_index is not None:
+            metadata = self._metadata_index.get(self._path)
+            if metadata is not None:
+                self._load_metadata(metadata)
 
     def _get_imc_file_panoramas(
         self, imc_file: IMCFileModel
@@ -23,8 +64,7 @@ class McdFileReader(FileReaderBase):
                 panorama.metadata.get("Type"),
                 panorama.description,
             )
-            for slide in self._mcd_file.slides
-            for panorama in slide.panoramas
+            for panorama in self._get_panoramas().values()
         ]
 
     def _get_imc_file_acquisitions(
@@ -37,18 +77,31 @@ class McdFileReader(FileReaderBase):
                 acquisition.description,
                 acquisition.channel_labels,
             )
-            for slide in self._mcd_file.slides
-            for acquisition in slide.acquisitions
+            for acquisition in self._get_acquisitions().values()
         ]
 
+    def _dump_metadata(self, imc_file: IMCFileModel) -> Dict[str, Any]:
+        metadata = super(McdFileReader, self)._dump_metadata(imc_file)
+        metadata["acquisition_infos"] = []
+        for acquisition in imc_file.acquisitions:
+            # invalid acquisitions fail when read, not when the file is opened
+            try:
+                info = self._get_acquisition_info(acquisition.id)
+                dims = [*(float(x) for x in info.dims[:5]), *info.dims[5:]]
+            except Exception:
+                continue  # ignored intentionally
+            metadata["acquisition_infos"].append([acquisition.id, dims, *info[1:]])
+        return metadata
+
+    def _load_metadata(self, metadata: Dict[str, Any]):
+        for acquisition_id, dims, *info in metadata["acquisition_infos"]:
+            self._acquisition_infos[acquisition_id] = McdFileReader.AcquisitionInfo(
+                ImageDimensions(*dims), *info
+            )
+
     def read_panorama(self, panorama_id: int) -> Tuple[ImageDimensions, np.ndarray]:
-        panorama = next(
-            panorama
-            for slide in self._mcd_file.slides
-            for panorama in slide.panoramas
-            if panorama.id == panorama_id
-        )
-        img = self._mcd_file.read_panorama(panorama)[::-1, :]
+        panorama = self._get_panoramas()[panorama_id]
+        img = self._mcd_file.read_panorama(panorama)
         rotation = -np.arctan2(
             panorama.points_um[1][1] - panorama.points_um[0][1],
             panorama.points_um[1][0] - panorama.points_um[0][0],
@@ -59,43 +112,246 @@ class McdFileReader(FileReaderBase):
             panorama.width_um,
             panorama.height_um,
             rotation=rotation,
+            flip_y=True,
         )
         return dims, img
 
-    def read_acquisition(
-        self, acquisition_id: int, channel_label: str
+    def _read_acquisition_stack(
+        self, acquisition_id: int
+    ) -> Tuple[ImageDimensions, np.ndarray]:
+        info = self._get_acquisition_info(acquisition_id)
+        acquisition = self._get_acquisition(acquisition_id)
+        img = self._mcd_file.read_acquisition(acquisition)
+        return info.dims._replace(flip_y=True), img
+
+    def _read_acquisition_channels(
+        self, acquisition_id: int, channel_indices: Sequence[int]
     ) -> Tuple[ImageDimensions, np.ndarray]:
-        acquisition = next(
-            acquisition
-            for slide in self._mcd_file.slides
-            for acquisition in slide.acquisitions
-            if acquisition.id == acquisition_id
+        info = self._get_acquisition_info(acquisition_id)
+        num_pixels = self._get_acquisition_num_pixels(info)
+        if num_pixels is None:
+            return super(McdFileReader, self)._read_acquisition_channels(
+                acquisition_id, channel_indices
+            )
+        # pixel records are read in chunks of rows, so that only the requested
+        # channels (and not all pixel records) are held in memory at once
+        num_values = len(info.channel_labels) + 3
+        chunk_height = max(1, self.READ_CHUNK_SIZE // info.width)
+        img = np.zeros(
+            (len(channel_indices), info.height, info.width), dtype=np.float32
         )
-        img = self._mcd_file.read_acquisition(acquisition)[
-            acquisition.channel_labels.index(channel_label), ::-1, :
-        ]
+        for y_start in range(0, info.height, chunk_height):
+            y_stop = min(y_start + chunk_height, info.height)
+            _read_acquisition_rows(
+                self._path,
+                info.data_offset,
+                num_values,
+                num_pixels,
+                info.width,
+                y_start,
+                y_stop,
+                channel_indices=channel_indices,
+                out=img[:, y_start:y_stop, :],
+            )
+        return info.dims._replace(flip_y=True), img
+
+    def _read_acquisition_stack_lazy(
+        self, acquisition_id: int
+    ) -> Optional[Tuple[ImageDimensions, "da.Array"]]:
+        info = self._get_acquisition_info(acquisition_id)
+        num_pixels = self._get_acquisition_num_pixels(info)
+        if num_pixels is None:
+            return None
+        # acquisition data is stored as consecutive pixel records (X, Y, Z,
+        # channels...) in row-major order, so a range of rows maps to a
+        # contiguous range of bytes; chunks therefore span full rows
+        num_channels = len(info.channel_labels)
+        num_values = num_channels + 3
+        width, height = info.width, info.height
+        chunk_height = min(height, max(1, self.LAZY_CHUNK_SIZE // width))
+        chunks = (
+            (1,) * num_channels,
+            (chunk_height,) * (height // chunk_height)
+            + ((height % chunk_height,) if height % chunk_height > 0 else ()),
+            (width,),
+        )
+
+        def read_chunk(block_info=None) -> np.ndarray:
+            (c_start, c_stop), (y_start, y_stop), _ = block_info[None]["array-location"]
+            return _read_acquisition_rows(
+                self._path,
+                info.data_offset,
+                num_values,
+                num_pixels,
+                width,
+                y_start,
+                y_stop,
+                channel_indices=range(c_start, c_stop),
+            )
+
+        img = da.map_blocks(
+            read_chunk,
+            chunks=chunks,
+            dtype=np.float32,
+            meta=np.empty((0, 0, 0), dtype=np.float32),
+        )
+        return info.dims._replace(flip_y=True), img
+
+    def _read_acquisition_stack_memmap(
+        self, acquisition_id: int
+    ) -> Optional[Tuple[ImageDimensions, np.memmap]]:
+        info = self._get_acquisition_info(acquisition_id)
+        num_pixels = self._get_acquisition_num_pixels(info)
+        if num_pixels is None or num_pixels < info.width * info.height:
+            return None
+        num_channels = len(info.channel_labels)
+        records = np.memmap(
+            self._path,
+            dtype=np.dtype(
+                [
+                    ("xyz", np.float32, (3,)),
+                    ("channels", np.float32, (num_channels,)),
+                ]
+            ),
+            mode="r",
+            offset=info.data_offset,
+            shape=(info.height, info.width),
+        )
+        # pixel records can only be used in place if they form a complete
+        # row-major grid
+        xyz = records["xyz"]
+        if (
+            tuple(xyz[0, 0, :2]) != (0, 0)
+            or tuple(xyz[-1, 0, :2]) != (0, info.height - 1)
+            or tuple(xyz[-1, -1, :2]) != (info.width - 1, info.height - 1)
+        ):
+            return None
+        img = np.moveaxis(records["channels"], -1, 0)
+        return info.dims._replace(flip_y=True), img
+
+    def _get_acquisition_num_pixels(
+        self, info: "McdFileReader.AcquisitionInfo"
+    ) -> Optional[int]:
+        # pixel records are only read at the stored offsets (i.e. not through
+        # readimc) if they are 32-bit and lie within the bounds of the file
+        record_size = (len(info.channel_labels) + 3) * info.value_bytes
+        if (
+            info.value_bytes != 4
+            or info.width <= 0
+            or info.height <= 0
+            or info.data_size <= 0
+            or info.data_size % record_size != 0
+            or info.data_offset + info.data_size > self._path.stat().st_size
+        ):
+            return None
+        return info.data_size // record_size
+
+    def _get_acquisition_info(
+        self, acquisition_id: int
+    ) -> "McdFileReader.AcquisitionInfo":
+        # acquisition infos are all that is needed to read acquisition data, so
+        # that files with indexed metadata do not have their schema parsed
+        info = self._acquisition_infos.get(acquisition_id)
+        if info is None:
+            acquisition = self._get_acquisition(acquisition_id)
+            data_offset = int(acquisition.metadata["DataStartOffset"])
+            info = McdFileReader.AcquisitionInfo(
+                self._get_acquisition_dimensions(acquisition),
+                list(acquisition.channel_labels),
+                data_offset,
+                int(acquisition.metadata["DataEndOffset"]) - data_offset,
+                acquisition.width_px or 0,
+                acquisition.height_px or 0,
+                int(acquisition.metadata.get("ValueBytes", 0)),
+            )
+            self._acquisition_infos[acquisition_id] = info
+        return info
+
+    def _get_acquisition_dimensions(self, acquisition: Acquisition) -> ImageDimensions:
         rotation = -np.arctan2(
             acquisition.roi_points_um[1][1] - acquisition.roi_points_um[0][1],
             acquisition.roi_points_um[1][0] - acquisition.roi_points_um[0][0],
         )
-        dims = ImageDimensions(
+        return ImageDimensions(
             acquisition.roi_points_um[0][0],
             acquisition.roi_points_um[0][1] - acquisition.height_um,
             acquisition.width_um,
             acquisition.height_um,
             rotation=rotation,
         )
-        return dims, img
+
+    def _get_acquisition_channel_labels(self, acquisition_id: int) -> Sequence[str]:
+        return self._get_acquisition_info(acquisition_id).channel_labels
+
+    def _get_acquisition(self, acquisition_id: int) -> Acquisition:
+        return self._get_acquisitions()[acquisition_id]
+
+    def _get_panoramas(self) -> Dict[int, Panorama]:
+        self._open_mcd_file()
+        return self._panoramas
+
+    def _get_acquisitions(self) -> Dict[int, Acquisition]:
+        self._open_mcd_file()
+        return self._acquisitions
+
+    def _open_mcd_file(self):
+        # the schema is only parsed (and indexed) when needed
+        if self._mcd_file is None:
+            mcd_file = MCDFile(self._path)
+            mcd_file.open()
+            for slide in mcd_file.slides:
+                for panorama in slide.panoramas:
+                    self._panoramas[panorama.id] = panorama
+                for acquisition in slide.acquisitions:
+                    self._acquisitions[acquisition.id] = acquisition
+            self._mcd_file = mcd_file
 
     def __enter__(self) -> "FileReaderBase":
-        self._mcd_file = MCDFile(self._path)
-        self._mcd_file.open()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._mcd_file.close()
-        self._mcd_file = None
+        if self._mcd_file is not None:
+            self._mcd_file.close()
+            self._mcd_file = None
+            self._panoramas.clear()
+            self._acquisitions.clear()
 
     @classmethod
     def accepts(cls, path: Union[str, Path]) -> bool:
         return Path(path).suffix.lower() == ".mcd"
+
+
+def _read_acquisition_rows(
+    path: Path,
+    data_offset: int,
+    num_values: int,
+    num_pixels: int,
+    width: int,
+    y_start: int,
+    y_stop: int,
+    channel_indices: Sequence[int],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    img = out
+    if img is None:
+        img = np.zeros(
+            (len(channel_indices), y_stop - y_start, width), dtype=np.float32
+        )
+    pixel_start = min(y_start * width, num_pixels)
+    pixel_stop = min(y_stop * width, num_pixels)
+    if pixel_stop > pixel_start:
+        data = np.fromfile(
+            path,
+            dtype=np.float32,
+            count=(pixel_stop - pixel_start) * num_values,
+            offset=data_offset + pixel_start * num_values * 4,
+        )
+        # files may be truncated, in which case fewer records are read
+        data = data[: data.size - data.size % num_values].reshape(-1, num_values)
+        xs = data[:, 0].astype(int)
+        ys = data[:, 1].astype(int) - y_start
+        mask = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < y_stop - y_start)
+        xs, ys, data = xs[mask], ys[mask], data[mask]
+        for i, channel_index in enumerate(channel_indices):
+            img[i, ys, xs] = data[:, channel_index + 3]
+    return img
@@ -0,0 +1,138 @@
+import json
+import sqlite3
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, List, Optional, Union
+
+
+class MetadataIndex:
+    VERSION = 2
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._lock = RLock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS imc_files ("
+                "path TEXT PRIMARY KEY, "
+                "size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, "
+                "version INTEGER NOT NULL, "
+                "metadata TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS acquisition_statistics ("
+                "path TEXT NOT NULL, "
+                "acquisition_id INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, "
+                "version INTEGER NOT NULL, "
+                "statistics TEXT NOT NULL, "
+                "PRIMARY KEY (path, acquisition_id))"
+            )
+
+    def get(self, path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+        path = Path(path).resolve()
+        try:
+            stat_result = path.stat()
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT metadata FROM imc_files "
+                    "WHERE path = ? AND size = ? AND mtime_ns = ? AND version = ?",
+                    (
+                        str(path),
+                        stat_result.st_size,
+                        stat_result.st_mtime_ns,
+                        self.VERSION,
+                    ),
+                ).fetchone()
+        except (OSError, sqlite3.Error):
+            return None  # ignored intentionally
+        if row is not None:
+            return json.loads(row[0])
+        return None
+
+    def put(self, path: Union[str, Path], metadata: Dict[str, Any]):
+        path = Path(path).resolve()
+        try:
+            stat_result = path.stat()
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO imc_files VALUES (?, ?, ?, ?, ?)",
+                    (
+                        str(path),
+                        stat_result.st_size,
+                        stat_result.st_mtime_ns,
+                        self.VERSION,
+                        json.dumps(metadata),
+                    ),
+                )
+        except (OSError, sqlite3.Error):
+            pass  # ignored intentionally
+
+    def get_acquisition_statistics(
+        self, path: Union[str, Path], acquisition_id: int
+    ) -> Optional[List[Any]]:
+        path = Path(path).resolve()
+        try:
+            stat_result = path.stat()
+            with self._lock:
+                row = self._connection.execute(
+                    "SELECT statistics FROM acquisition_statistics "
+                    "WHERE path = ? AND acquisition_id = ? "
+                    "AND size = ? AND mtime_ns = ? AND version = ?",
+                    (
+                        str(path),
+                        acquisition_id,
+                        stat_result.st_size,
+                        stat_result.st_mtime_ns,
+                        self.VERSION,
+                    ),
+                ).fetchone()
+        except (OSError, sqlite3.Error):
+            return None  # ignored intentionally
+        if row is not None:
+            return json.loads(row[0])
+        return None
+
+    def put_acquisition_statistics(
+        self, path: Union[str, Path], acquisition_id: int, statistics: List[Any]
+    ):
+        path = Path(path).resolve()
+        try:
+            stat_result = path.stat()
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO acquisition_statistics "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        str(path),
+                        acquisition_id,
+                        stat_result.st_size,
+                        stat_result.st_mtime_ns,
+                        self.VERSION,
+                        json.dumps(statistics),
+                    ),
+                )
+        except (OSError, sqlite3.Error):
+            pass  # ignored intentionally
+
+    def invalidate(self, path: Union[str, Path]):
+        path = Path(path).resolve()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM imc_files WHERE path = ?", (str(path),)
+            )
+            self._connection.execute(
+                "DELETE FROM acquisition_statistics WHERE path = ?", (str(path),)
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    @property
+    def path(self) -> Path:
+        return self._path
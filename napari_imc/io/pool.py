@@ -0,0 +1,150 @@
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock, RLock
+from typing import Dict, Iterator, Optional, Type
+
+from ..io.base import FileReaderBase
+from ..models import IMCFileModel
+
+
+class FileReaderPool:
+    def __init__(
+        self, max_size: int = 8, idle_timeout: Optional[float] = 300.0
+    ) -> None:
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._file_readers: "OrderedDict[IMCFileModel, FileReaderBase]" = OrderedDict()
+        self._file_reader_locks: Dict[IMCFileModel, Lock] = {}
+        self._file_reader_users: Dict[IMCFileModel, int] = {}
+        self._last_used: Dict[IMCFileModel, float] = {}
+        self._lock = RLock()
+
+    @contextmanager
+    def open(
+        self,
+        imc_file: IMCFileModel,
+        file_reader_type: Type[FileReaderBase],
+        **file_reader_kwargs,
+    ) -> Iterator[FileReaderBase]:
+        # file readers that are not thread-safe are used by at most one thread
+        # at a time; different files can be read concurrently
+        file_reader_lock = self._acquire_file_reader_lock(imc_file)
+        locked = True
+        try:
+            # files may have been closed while waiting for the lock
+            if imc_file.is_deleted:
+                raise IOError(f"File has been closed: {imc_file.path}")
+            with self._lock:
+                file_reader = self._file_readers.get(imc_file)
+            if file_reader is None:
+                file_reader = file_reader_type(imc_file.path, **file_reader_kwargs)
+                file_reader.__enter__()
+            with self._lock:
+                self._add(imc_file, file_reader)
+                self._file_reader_users[imc_file] = (
+                    self._file_reader_users.get(imc_file, 0) + 1
+                )
+            if file_reader_type.has_capabilities(FileReaderBase.Capability.THREAD_SAFE):
+                file_reader_lock.release()
+                locked = False
+            try:
+                yield file_reader
+            finally:
+                self._release(imc_file)
+        finally:
+            if locked:
+                file_reader_lock.release()
+
+    def add(self, imc_file: IMCFileModel, file_reader: FileReaderBase):
+        file_reader_lock = self._acquire_file_reader_lock(imc_file)
+        try:
+            with self._lock:
+                self._add(imc_file, file_reader)
+        finally:
+            file_reader_lock.release()
+
+    def close(self, imc_file: IMCFileModel):
+        file_reader_lock = self._acquire_file_reader_lock(imc_file)
+        try:
+            with self._lock:
+                self._close(imc_file)
+        finally:
+            file_reader_lock.release()
+
+    def close_idle(self):
+        if self._idle_timeout is not None:
+            with self._lock:
+                now = time.monotonic()
+                for imc_file, last_used in list(self._last_used.items()):
+                    if now - last_used > self._idle_timeout:
+                        self._try_close(imc_file)
+
+    def close_all(self):
+        for imc_file in list(self._file_readers.keys()):
+            self.close(imc_file)
+
+    def _acquire_file_reader_lock(self, imc_file: IMCFileModel) -> Lock:
+        # locks are discarded when closing file readers, in which case waiting
+        # threads acquire the lock of the file again
+        while True:
+            with self._lock:
+                file_reader_lock = self._file_reader_locks.setdefault(imc_file, Lock())
+            file_reader_lock.acquire()
+            with self._lock:
+                if self._file_reader_locks.get(imc_file) is file_reader_lock:
+                    return file_reader_lock
+            file_reader_lock.release()
+
+    def _release(self, imc_file: IMCFileModel):
+        with self._lock:
+            self._file_reader_users[imc_file] -= 1
+            if self._file_reader_users[imc_file] == 0:
+                del self._file_reader_users[imc_file]
+                # thread-safe file readers may have been closed while in use
+                if imc_file not in self._file_readers:
+                    self._try_close(imc_file)
+            self.close_idle()
+
+    def _add(self, imc_file: IMCFileModel, file_reader: FileReaderBase):
+        self._file_readers[imc_file] = file_reader
+        self._file_readers.move_to_end(imc_file)
+        self._last_used[imc_file] = time.monotonic()
+        self.close_idle()
+        for lru_imc_file in list(self._file_readers.keys()):
+            if len(self._file_readers) <= self._max_size:
+                break
+            if lru_imc_file is not imc_file:
+                self._try_close(lru_imc_file)
+
+    def _try_close(self, imc_file: IMCFileModel) -> bool:
+        # file readers that are currently in use are left open
+        file_reader_lock = self._file_reader_locks.get(imc_file)
+        if file_reader_lock is not None and file_reader_lock.acquire(blocking=False):
+            try:
+                if imc_file not in self._file_reader_users:
+                    self._close(imc_file)
+                    return True
+            finally:
+                file_reader_lock.release()
+        return False
+
+    def _close(self, imc_file: IMCFileModel):
+        # called holding the lock of the file (if any)
+        file_reader = self._file_readers.pop(imc_file, None)
+        self._last_used.pop(imc_file, None)
+        if imc_file not in self._file_reader_users:
+            self._file_reader_locks.pop(imc_file, None)
+        if file_reader is not None:
+            file_reader.__exit__(None, None, None)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def idle_timeout(self) -> Optional[float]:
+        return self._idle_timeout
+
+    def __len__(self) -> int:
+        return len(self._file_readers)
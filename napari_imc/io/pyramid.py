@@ -0,0 +1,30 @@
+from typing import List
+
+import numpy as np
+
+
+def create_image_pyramid(img: np.ndarray, min_size: int = 1024) -> List[np.ndarray]:
+    levels = [img]
+    while max(levels[-1].shape[:2]) > min_size:
+        levels.append(downsample_image(levels[-1]))
+    return levels
+
+
+def downsample_image(img: np.ndarray) -> np.ndarray:
+    # 2x2 mean; odd trailing rows/columns are dropped
+    height, width = img.shape[0] // 2 * 2, img.shape[1] // 2 * 2
+    img = img[:height, :width]
+    if img.dtype == np.uint8:
+        dtype = np.uint16
+    else:
+        dtype = np.result_type(img.dtype, np.float32)
+    downsampled_img = np.zeros((height // 2, width // 2) + img.shape[2:], dtype=dtype)
+    for y_offset in (0, 1):
+        for x_offset in (0, 1):
+            downsampled_img += img[y_offset::2, x_offset::2]
+    if np.issubdtype(dtype, np.integer):
+        downsampled_img += 2
+        downsampled_img //= 4
+    else:
+        downsampled_img /= 4
+    return downsampled_img.astype(img.dtype)
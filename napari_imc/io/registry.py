@@ -0,0 +1,80 @@
+from functools import lru_cache
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Type, Union
+
+from ..io.base import FileReaderBase
+from .imaxt import ImaxtFileReader
+from .mcd import McdFileReader
+from .txt import TxtFileReader
+
+
+class FileReaderRegistry:
+    ENTRY_POINT_GROUP = "napari_imc.readers"
+
+    def __init__(self, file_reader_types: Iterable[Type[FileReaderBase]] = ()) -> None:
+        self._file_reader_types: List[Type[FileReaderBase]] = list(file_reader_types)
+        # incremented on changes, e.g. for invalidating memoized lookups
+        self._version = 0
+
+    def register(self, file_reader_type: Type[FileReaderBase], first: bool = False):
+        if not issubclass(file_reader_type, FileReaderBase):
+            raise TypeError(f"Not a file reader: {file_reader_type}")
+        if file_reader_type not in self._file_reader_types:
+            if first:
+                self._file_reader_types.insert(0, file_reader_type)
+            else:
+                self._file_reader_types.append(file_reader_type)
+            self._version += 1
+
+    def unregister(self, file_reader_type: Type[FileReaderBase]):
+        if file_reader_type in self._file_reader_types:
+            self._file_reader_types.remove(file_reader_type)
+            self._version += 1
+
+    def load_entry_points(self):
+        # third-party file readers take precedence over the built-in ones
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            eps = eps.select(group=self.ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(self.ENTRY_POINT_GROUP, [])
+        for entry_point in reversed(list(eps)):
+            try:
+                self.register(entry_point.load(), first=True)
+            except Exception:
+                pass  # ignored intentionally
+
+    def find(
+        self,
+        path: Union[str, Path],
+        capabilities: FileReaderBase.Capability = FileReaderBase.Capability.NONE,
+    ) -> Optional[Type[FileReaderBase]]:
+        return next(
+            (
+                file_reader_type
+                for file_reader_type in self._file_reader_types
+                if file_reader_type.has_capabilities(capabilities)
+                and file_reader_type.accepts(path)
+            ),
+            None,
+        )
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __iter__(self) -> Iterator[Type[FileReaderBase]]:
+        return iter(self._file_reader_types)
+
+    def __len__(self) -> int:
+        return len(self._file_reader_types)
+
+
+@lru_cache(maxsize=None)
+def get_file_reader_registry() -> FileReaderRegistry:
+    file_reader_registry = FileReaderRegistry(
+        [ImaxtFileReader, McdFileReader, TxtFileReader]
+    )
+    file_reader_registry.load_entry_points()
+    return file_reader_registry
@@ -0,0 +1,63 @@
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+PERCENTILES = (0.1, 1.0, 5.0, 25.0, 50.0, 75.0, 95.0, 99.0, 99.9)
+
+
+class ChannelStatistics(NamedTuple):
+    min: float
+    max: float
+    percentiles: Tuple[float, ...]  # values at PERCENTILES
+    histogram: Tuple[int, ...]  # equally sized bins from min to max
+
+    def get_percentile(self, q: float) -> float:
+        return float(np.interp(q, PERCENTILES, self.percentiles))
+
+
+def compute_channel_statistics(
+    img: np.ndarray, num_bins: int = 256
+) -> List[ChannelStatistics]:
+    # channels of the (c, y, x) stack are processed (and loaded) one at a time
+    return [
+        _compute_single_channel_statistics(img[i], num_bins)
+        for i in range(img.shape[0])
+    ]
+
+
+def _compute_single_channel_statistics(
+    channel_img: np.ndarray, num_bins: int
+) -> ChannelStatistics:
+    channel_img = np.asarray(channel_img).ravel()
+    if channel_img.size == 0:
+        return ChannelStatistics(0.0, 0.0, (0.0,) * len(PERCENTILES), (0,) * num_bins)
+    min_value = float(channel_img.min())
+    max_value = float(channel_img.max())
+    percentiles = np.percentile(channel_img, PERCENTILES)
+    histogram, _ = np.histogram(
+        channel_img,
+        bins=num_bins,
+        range=(min_value, max_value if max_value > min_value else min_value + 1.0),
+    )
+    return ChannelStatistics(
+        min_value,
+        max_value,
+        tuple(float(x) for x in percentiles),
+        tuple(int(x) for x in histogram),
+    )
+
+
+def dump_channel_statistics(statistics: Sequence[ChannelStatistics]) -> List[list]:
+    return [list(channel_statistics) for channel_statistics in statistics]
+
+
+def load_channel_statistics(statistics: Sequence[list]) -> List[ChannelStatistics]:
+    return [
+        ChannelStatistics(
+            channel_statistics[0],
+            channel_statistics[1],
+            tuple(channel_statistics[2]),
+            tuple(channel_statistics[3]),
+        )
+        for channel_statistics in statistics
+    ]
@@ -1,23 +1,20 @@
 import re
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 from readimc import TXTFile
 
 from ..io.base import FileReaderBase, ImageDimensions
-from ..models import IMCFileAcquisitionModel, IMCFileModel, IMCFilePanoramaModel
+from ..models import IMCFileAcquisitionModel, IMCFileModel
 
 
 class TxtFileReader(FileReaderBase):
-    def __init__(self, path: Union[str, Path]) -> None:
-        super(TxtFileReader, self).__init__(path)
-        self._txt_file: Optional[TXTFile] = None
+    MAGIC = b"Start_push"
 
-    def _get_imc_file_panoramas(
-        self, imc_file: IMCFileModel
-    ) -> List[IMCFilePanoramaModel]:
-        return []
+    def __init__(self, path: Union[str, Path], **kwargs) -> None:
+        super(TxtFileReader, self).__init__(path, **kwargs)
+        self._txt_file: Optional[TXTFile] = None
 
     def _get_imc_file_acquisitions(
         self, imc_file: IMCFileModel
@@ -36,18 +33,16 @@ class TxtFileReader(FileReaderBase):
             )
         ]
 
-    def read_panorama(self, panorama_id: int) -> Tuple[ImageDimensions, np.ndarray]:
-        raise RuntimeError("This operation is not supported")
-
-    def read_acquisition(
-        self, acquisition_id: int, channel_label: str
+    def _read_acquisition_stack(
+        self, acquisition_id: int
     ) -> Tuple[ImageDimensions, np.ndarray]:
-        img = self._txt_file.read_acquisition()[
-            self._txt_file.channel_labels.index(channel_label), ::-1, :
-        ]
-        dims = ImageDimensions(0, 0, img.shape[1], img.shape[0])
+        img = self._txt_file.read_acquisition()
+        dims = ImageDimensions(0, 0, img.shape[2], img.shape[1], flip_y=True)
         return dims, img
 
+    def _get_acquisition_channel_labels(self, acquisition_id: int) -> Sequence[str]:
+        return self._txt_file.channel_labels
+
     def __enter__(self) -> "FileReaderBase":
         self._txt_file = TXTFile(self._path)
         self._txt_file.open()
@@ -59,4 +54,11 @@ class TxtFileReader(FileReaderBase):
 
     @classmethod
     def accepts(cls, path: Union[str, Path]) -> bool:
-        return Path(path).suffix.lower() == ".txt"
+        path = Path(path)
+        if path.suffix.lower() == ".txt":
+            try:
+                with path.open("rb") as f:
+                    return f.read(len(cls.MAGIC)) == cls.MAGIC
+            except OSError:
+                pass  # ignored intentionally
+        return False
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from itertools import chain
+from pathlib import Path
+from threading import RLock
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..io.base import ImageDimensions
+
+try:
+    import zarr  # type: ignore
+except Exception:
+    zarr = None
+
+
+class ZarrCache:
+    ACQUISITION_CHUNKS = (1, 512, 512)
+    PANORAMA_CHUNKS = (512, 512)
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        if zarr is None:
+            raise RuntimeError("The zarr package is required for caching to disk")
+        self._directory = Path(directory)
+        self._groups: Dict[Path, "zarr.hierarchy.Group"] = {}
+        self._lock = RLock()
+
+    def contains(self, path: Union[str, Path]) -> bool:
+        return self._get_store_path(path).is_dir()
+
+    @contextmanager
+    def create(self, path: Union[str, Path]) -> Iterator["ZarrCache.Writer"]:
+        # the store is written to a temporary location and only moved to its
+        # final location once complete, so that partial stores are never read
+        store_path = self._get_store_path(path)
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_store_path = Path(
+            tempfile.mkdtemp(
+                prefix=f"{store_path.name}.", suffix=".tmp", dir=store_path.parent
+            )
+        )
+        try:
+            group = zarr.open_group(str(tmp_store_path), mode="w")
+            group.attrs["path"] = str(Path(path).resolve())
+            yield ZarrCache.Writer(group)
+            if not store_path.exists():
+                os.replace(tmp_store_path, store_path)
+        finally:
+            shutil.rmtree(tmp_store_path, ignore_errors=True)
+
+    def read_panorama_pyramid(
+        self, path: Union[str, Path], panorama_id: int
+    ) -> Optional[Tuple[ImageDimensions, List["zarr.Array"]]]:
+        group = self._open_group(path)
+        if group is not None and f"panoramas/{panorama_id}" in group:
+            panorama_group = group[f"panoramas/{panorama_id}"]
+            dims = ImageDimensions(*panorama_group.attrs["dims"])
+            levels = [
+                panorama_group[str(level)]
+                for level in range(panorama_group.attrs["num_levels"])
+            ]
+            return dims, levels
+        return None
+
+    def read_acquisition_stack(
+        self, path: Union[str, Path], acquisition_id: int
+    ) -> Optional[Tuple[ImageDimensions, "zarr.Array"]]:
+        group = self._open_group(path)
+        if group is not None and f"acquisitions/{acquisition_id}" in group:
+            img = group[f"acquisitions/{acquisition_id}"]
+            return ImageDimensions(*img.attrs["dims"]), img
+        return None
+
+    def _open_group(self, path: Union[str, Path]) -> Optional["zarr.hierarchy.Group"]:
+        store_path = self._get_store_path(path)
+        with self._lock:
+            group = self._groups.get(store_path)
+            if group is None and store_path.is_dir():
+                group = zarr.open_group(str(store_path), mode="r")
+                self._groups[store_path] = group
+            return group
+
+    def _get_store_path(self, path: Union[str, Path]) -> Path:
+        path = Path(path).resolve()
+        stat_result = path.stat()
+        key = f"{path}:{stat_result.st_size}:{stat_result.st_mtime_ns}"
+        return self._directory / f"{hashlib.sha1(key.encode()).hexdigest()}.zarr"
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    class Writer:
+        def __init__(self, group: "zarr.hierarchy.Group") -> None:
+            self._group = group
+
+        def write_panorama_pyramid(
+            self, panorama_id: int, dims: ImageDimensions, levels: Sequence[np.ndarray]
+        ):
+            panorama_group = self._group.require_group(f"panoramas/{panorama_id}")
+            panorama_group.attrs["dims"] = [float(x) for x in dims]
+            panorama_group.attrs["num_levels"] = len(levels)
+            for level, img in enumerate(levels):
+                panorama_group.create_dataset(
+                    str(level),
+                    data=np.asarray(img),
+                    chunks=ZarrCache.PANORAMA_CHUNKS + img.shape[2:],
+                )
+
+        def write_acquisition_channels(
+            self,
+            acquisition_id: int,
+            dims: ImageDimensions,
+            channel_imgs: Iterable[np.ndarray],
+            num_channels: int,
+        ):
+            # channels are written one at a time, as they are read
+            channel_imgs = iter(channel_imgs)
+            first_channel_img = next(channel_imgs, None)
+            if first_channel_img is None:
+                return
+            first_channel_img = np.asarray(first_channel_img)
+            acquisitions_group = self._group.require_group("acquisitions")
+            img = acquisitions_group.create_dataset(
+                str(acquisition_id),
+                shape=(num_channels, *first_channel_img.shape),
+                dtype=first_channel_img.dtype,
+                chunks=ZarrCache.ACQUISITION_CHUNKS,
+            )
+            img.attrs["dims"] = [float(x) for x in dims]
+            for i, channel_img in enumerate(chain([first_channel_img], channel_imgs)):
+                img[i] = np.asarray(channel_img)
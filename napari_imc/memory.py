@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class MemoryBudget:
+    class Entry(NamedTuple):
+        buffer_ids: Tuple[int, ...]
+        evict: Callable[[], None]
+        evictable: bool
+        priority: int  # entries of lower priority are evicted first
+
+    class Buffer(NamedTuple):
+        array: np.ndarray
+        num_entries: int
+        num_pinned_entries: int  # entries that are not evictable
+
+    def __init__(self, max_bytes: int = 4 * 1024**3) -> None:
+        self._max_bytes = max_bytes
+        # least recently used first
+        self._entries: "OrderedDict[Hashable, MemoryBudget.Entry]" = OrderedDict()
+        # buffers shared by entries (e.g. views of the same stack) count once
+        self._buffers: Dict[int, MemoryBudget.Buffer] = {}
+        self._nbytes = 0
+        self._lock = RLock()
+
+    def add(
+        self,
+        key: Hashable,
+        data: Any,
+        evict: Callable[[], None],
+        evictable: bool = False,
+        priority: int = 0,
+    ) -> bool:
+        buffers = self.get_buffers(data)
+        with self._lock:
+            self._remove(key)
+            if len(buffers) == 0:
+                return False
+            for buffer in buffers:
+                buffer = self._buffers.get(
+                    id(buffer), MemoryBudget.Buffer(buffer, 0, 0)
+                )
+                if buffer.num_entries == 0:
+                    self._nbytes += buffer.array.nbytes
+                self._buffers[id(buffer.array)] = buffer._replace(
+                    num_entries=buffer.num_entries + 1,
+                    num_pinned_entries=buffer.num_pinned_entries + (not evictable),
+                )
+            self._entries[key] = MemoryBudget.Entry(
+                tuple(id(buffer) for buffer in buffers), evict, evictable, priority
+            )
+            return True
+
+    def touch(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+    def set_evictable(self, key: Hashable, evictable: bool):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.evictable != evictable:
+                    for buffer_id in entry.buffer_ids:
+                        buffer = self._buffers[buffer_id]
+                        self._buffers[buffer_id] = buffer._replace(
+                            num_pinned_entries=buffer.num_pinned_entries
+                            + (-1 if evictable else 1)
+                        )
+                self._entries[key] = entry._replace(evictable=evictable)
+                self._entries.move_to_end(key)
+
+    def remove(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def enforce(self):
+        # only data that is not currently viewed is evicted; eviction callbacks
+        # are called without holding the lock, as they may call back
+        evicted_entries = []
+        with self._lock:
+            while self._nbytes > self._max_bytes:
+                key = self._find_evictable_key()
+                if key is None:
+                    break
+                evicted_entries.append(self._entries[key])
+                self._remove(key)
+        for entry in evicted_entries:
+            entry.evict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def _find_evictable_key(self) -> Optional[Hashable]:
+        # entries are evicted by priority, least recently used first, if that
+        # frees memory; otherwise, entries sharing buffers with other evictable
+        # entries only (e.g. hidden layers viewing cached images) are evicted,
+        # so that the shared buffers can be freed. Buffers that are shared with
+        # entries that are not evictable (e.g. visible layers) are never freed
+        shared_key = None
+        for key, entry in sorted(
+            self._entries.items(), key=lambda item: item[1].priority
+        ):
+            if entry.evictable:
+                buffers = [self._buffers[i] for i in entry.buffer_ids]
+                if any(buffer.num_entries == 1 for buffer in buffers):
+                    return key
+                if shared_key is None and any(
+                    buffer.num_pinned_entries == 0 for buffer in buffers
+                ):
+                    shared_key = key
+        return shared_key
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for buffer_id in entry.buffer_ids:
+                buffer = self._buffers[buffer_id]
+                if buffer.num_entries == 1:
+                    del self._buffers[buffer_id]
+                    self._nbytes -= buffer.array.nbytes
+                else:
+                    self._buffers[buffer_id] = buffer._replace(
+                        num_entries=buffer.num_entries - 1,
+                        num_pinned_entries=buffer.num_pinned_entries
+                        - (not entry.evictable),
+                    )
+
+    @staticmethod
+    def get_buffers(data: Any) -> List[np.ndarray]:
+        # arrays are accounted for by the memory they are views of, if any;
+        # lazily read (e.g. dask/zarr) and memory-mapped data is not counted
+        if isinstance(data, (list, tuple)):
+            buffers = {}
+            for img in data:
+                for buffer in MemoryBudget.get_buffers(img):
+                    buffers[id(buffer)] = buffer
+            return list(buffers.values())
+        if not isinstance(data, np.ndarray):
+            return []
+        while isinstance(data.base, np.ndarray):
+            data = data.base
+        if isinstance(data, np.memmap) or data.nbytes == 0:
+            return []
+        return [data]
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -49,6 +49,10 @@ class IMCFileTreeItem:
     def imc_file_tree_is_checked(self, imc_file_tree_is_checked: bool):
         pass
 
+    @property
+    def is_deleted(self) -> bool:
+        return self._deleted
+
     def mark_deleted(self):
         self._deleted = True
         for child in self._imc_file_tree_children:
@@ -1,11 +1,13 @@
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
-
-from napari.layers import Image
-from napari.utils import Colormap
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, KeysView, Optional, Tuple
 
 from .base import ModelBase
 
 if TYPE_CHECKING:
+    from napari.layers import Image
+    from napari.utils import Colormap
+
+    from ..composite import AcquisitionComposite
     from .imc_file_acquisition import IMCFileAcquisitionModel
 
 Color = Tuple[float, float, float, float]
@@ -29,9 +31,13 @@ class ChannelModel(ModelBase):
         self._blending = blending
         self._interpolation = interpolation
         self._contrast_limits = None
-        self._loaded_imc_file_acquisitions: List["IMCFileAcquisitionModel"] = []
+        # dict keys are used as an insertion-ordered set
+        self._loaded_imc_file_acquisitions: Dict["IMCFileAcquisitionModel", None] = {}
         self._shown_imc_file_acquisition_layers: Dict[
-            "IMCFileAcquisitionModel", Image
+            "IMCFileAcquisitionModel", "Image"
+        ] = {}
+        self._shown_imc_file_acquisition_composites: Dict[
+            "IMCFileAcquisitionModel", "AcquisitionComposite"
         ] = {}
         self._is_shown = False
 
@@ -48,6 +54,7 @@ class ChannelModel(ModelBase):
         self._opacity = opacity
         for layer in self._shown_imc_file_acquisition_layers.values():
             layer.opacity = opacity
+        self._update_composites()
 
     @property
     def contrast_limits(self) -> Optional[Tuple[float, float]]:
@@ -58,6 +65,25 @@ class ChannelModel(ModelBase):
         self._contrast_limits = contrast_limits
         for layer in self._shown_imc_file_acquisition_layers.values():
             layer.contrast_limits = contrast_limits
+        self._update_composites()
+
+    @property
+    def contrast_limits_range(self) -> Optional[Tuple[float, float]]:
+        channel_statistics = [
+            imc_file_acquisition.channel_statistics[self._label]
+            for imc_file_acquisition in (
+                *self._shown_imc_file_acquisition_layers,
+                *self._shown_imc_file_acquisition_composites,
+            )
+            if imc_file_acquisition.channel_statistics is not None
+            and self._label in imc_file_acquisition.channel_statistics
+        ]
+        if len(channel_statistics) > 0:
+            return (
+                min(statistics.min for statistics in channel_statistics),
+                max(statistics.max for statistics in channel_statistics),
+            )
+        return None
 
     @property
     def gamma(self) -> float:
@@ -68,6 +94,7 @@ class ChannelModel(ModelBase):
         self._gamma = gamma
         for layer in self._shown_imc_file_acquisition_layers.values():
             layer.gamma = gamma
+        self._update_composites()
 
     @property
     def color(self) -> Color:
@@ -76,8 +103,10 @@ class ChannelModel(ModelBase):
     @color.setter
     def color(self, color: Color):
         self._color = color
+        colormap = self.create_colormap()
         for layer in self._shown_imc_file_acquisition_layers.values():
-            layer.colormap = self.create_colormap()
+            layer.colormap = colormap
+        self._update_composites()
 
     @property
     def blending(self) -> str:
@@ -100,34 +129,72 @@ class ChannelModel(ModelBase):
             layer.interpolation = interpolation
 
     @property
-    def loaded_imc_file_acquisitions(self) -> List["IMCFileAcquisitionModel"]:
-        return self._loaded_imc_file_acquisitions
+    def loaded_imc_file_acquisitions(self) -> KeysView["IMCFileAcquisitionModel"]:
+        return self._loaded_imc_file_acquisitions.keys()
 
     @property
     def shown_imc_file_acquisition_layers(
         self,
-    ) -> Dict["IMCFileAcquisitionModel", Image]:
+    ) -> Dict["IMCFileAcquisitionModel", "Image"]:
         return self._shown_imc_file_acquisition_layers
 
+    @property
+    def shown_imc_file_acquisition_composites(
+        self,
+    ) -> Dict["IMCFileAcquisitionModel", "AcquisitionComposite"]:
+        return self._shown_imc_file_acquisition_composites
+
     @property
     def is_shown(self) -> bool:
         return self._is_shown
 
+    def add_loaded_imc_file_acquisition(
+        self, imc_file_acquisition: "IMCFileAcquisitionModel"
+    ):
+        self._loaded_imc_file_acquisitions[imc_file_acquisition] = None
+
+    def remove_loaded_imc_file_acquisition(
+        self, imc_file_acquisition: "IMCFileAcquisitionModel"
+    ):
+        del self._loaded_imc_file_acquisitions[imc_file_acquisition]
+
     def set_shown(
-        self, imc_file_acquisition_layers: Dict["IMCFileAcquisitionModel", Image]
+        self, imc_file_acquisition_layers: Dict["IMCFileAcquisitionModel", "Image"]
     ):
         self._shown_imc_file_acquisition_layers.clear()
         self._shown_imc_file_acquisition_layers.update(imc_file_acquisition_layers)
+        self._shown_imc_file_acquisition_composites.clear()
         self._is_shown = True
 
     def set_hidden(self):
         self._shown_imc_file_acquisition_layers.clear()
+        self._shown_imc_file_acquisition_composites.clear()
         self._is_shown = False
 
-    def create_colormap(self) -> Colormap:
+    def is_imc_file_acquisition_shown(
+        self, imc_file_acquisition: "IMCFileAcquisitionModel"
+    ) -> bool:
+        return (
+            imc_file_acquisition in self._shown_imc_file_acquisition_layers
+            or imc_file_acquisition in self._shown_imc_file_acquisition_composites
+        )
+
+    def _update_composites(self):
+        for composite in self._shown_imc_file_acquisition_composites.values():
+            composite.update_channel(self)
+
+    def create_colormap(self) -> "Colormap":
+        return self.get_colormap(tuple(self._color))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def get_colormap(color: Color) -> "Colormap":
+        from napari.utils import Colormap  # not required for headless use
+
+        # colormaps are shared by all layers (and channels) of the same color
         return Colormap(
             name="IMC",
-            colors=[[0.0, 0.0, 0.0, self.color[-1]], list(self._color)],
+            colors=[[0.0, 0.0, 0.0, color[-1]], list(color)],
             interpolation="linear",
         )
 
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Type
 
 from .base import IMCFileTreeItem, ModelBase
 from .imc_file_acquisition import IMCFileAcquisitionModel
@@ -7,10 +7,16 @@ from .imc_file_panorama import IMCFilePanoramaModel
 
 
 class IMCFileModel(ModelBase, IMCFileTreeItem):
-    def __init__(self, path: Path, imc_file_tree_root_item: IMCFileTreeItem) -> None:
+    def __init__(
+        self,
+        path: Path,
+        imc_file_tree_root_item: IMCFileTreeItem,
+        file_reader_type: Optional[Type] = None,
+    ) -> None:
         ModelBase.__init__(self)
         IMCFileTreeItem.__init__(self)
         self._path = path
+        self._file_reader_type = file_reader_type
         self._panoramas: List[IMCFilePanoramaModel] = []
         self._acquisitions: List[IMCFileAcquisitionModel] = []
         self._imc_file_tree_root_item = imc_file_tree_root_item
@@ -25,6 +31,10 @@ class IMCFileModel(ModelBase, IMCFileTreeItem):
     def path(self) -> Path:
         return self._path
 
+    @property
+    def file_reader_type(self) -> Optional[Type]:
+        return self._file_reader_type
+
     @property
     def panoramas(self) -> List[IMCFilePanoramaModel]:
         return self._panoramas
@@ -1,8 +1,9 @@
-from typing import TYPE_CHECKING, Any, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 
 from .base import IMCFileTreeItem, ModelBase
 
 if TYPE_CHECKING:
+    from ..io.statistics import ChannelStatistics
     from .channel import ChannelModel
     from .imc_file import IMCFileModel
 
@@ -24,6 +25,7 @@ class IMCFileAcquisitionModel(ModelBase, IMCFileTreeItem):
         self._description = description
         self._channel_labels = list(channel_labels)
         self._loaded_channels: List["ChannelModel"] = []
+        self._channel_statistics: Optional[Dict[str, "ChannelStatistics"]] = None
         self._is_loaded = False
 
     @property
@@ -42,6 +44,16 @@ class IMCFileAcquisitionModel(ModelBase, IMCFileTreeItem):
     def channel_labels(self) -> List[str]:
         return self._channel_labels
 
+    @property
+    def channel_statistics(self) -> Optional[Dict[str, "ChannelStatistics"]]:
+        return self._channel_statistics
+
+    @channel_statistics.setter
+    def channel_statistics(
+        self, channel_statistics: Optional[Dict[str, "ChannelStatistics"]]
+    ):
+        self._channel_statistics = channel_statistics
+
     @property
     def loaded_channels(self) -> List["ChannelModel"]:
         return self._loaded_channels
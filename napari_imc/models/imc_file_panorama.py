@@ -1,10 +1,10 @@
 from typing import TYPE_CHECKING, Any, List, Optional
 
-from napari.layers import Image
-
 from .base import IMCFileTreeItem, ModelBase
 
 if TYPE_CHECKING:
+    from napari.layers import Image
+
     from .imc_file import IMCFileModel
 
 
@@ -24,7 +24,7 @@ class IMCFilePanoramaModel(ModelBase, IMCFileTreeItem):
         self._id = id_
         self._image_type = image_type
         self._description = description
-        self._shown_layer: Optional[Image] = None
+        self._shown_layer: Optional["Image"] = None
         self._is_shown = False
 
     @property
@@ -44,7 +44,7 @@ class IMCFilePanoramaModel(ModelBase, IMCFileTreeItem):
         return self._description
 
     @property
-    def shown_layer(self) -> Optional[Image]:
+    def shown_layer(self) -> Optional["Image"]:
         return self._shown_layer
 
     @property
@@ -67,7 +67,7 @@ class IMCFilePanoramaModel(ModelBase, IMCFileTreeItem):
     def imc_file_tree_is_checked(self) -> bool:
         return self.is_shown
 
-    def set_shown(self, layer: Image):
+    def set_shown(self, layer: Optional["Image"] = None):
         self._shown_layer = layer
         self._is_shown = True
 
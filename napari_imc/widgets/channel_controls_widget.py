@@ -1,8 +1,8 @@
-from typing import TYPE_CHECKING, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
 
 from napari.layers.base.base import Blending
 from napari.layers.image.image import Interpolation
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QTimer
 from qtpy.QtGui import QColor
 from qtpy.QtWidgets import QComboBox, QFormLayout, QSlider, QWidget
 from superqt import QDoubleRangeSlider
@@ -11,6 +11,7 @@ from ._color_picker import ColorPicker
 
 if TYPE_CHECKING:
     from ..imc_controller import IMCController
+    from ..models import ChannelModel
 
 
 # https://github.com/napari/napari/blob/77426246caa9db492fbd0645d78be02e4aa4024b/napari/_qt/layer_controls/qt_image_controls_base.py
@@ -23,11 +24,20 @@ class _QDoubleRangeSlider(QDoubleRangeSlider):
 
 
 class ChannelControlsWidget(QWidget):
+    UPDATE_INTERVAL = 16  # milliseconds
+
     def __init__(
         self, controller: "IMCController", parent: Optional[QWidget] = None
     ) -> None:
         super(ChannelControlsWidget, self).__init__(parent)
         self._controller = controller
+        # slider changes are coalesced and applied at most once per interval
+        self._pending_updates: Dict[str, Any] = {}
+        self._pending_update_channels: Tuple["ChannelModel", ...] = ()
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(self.UPDATE_INTERVAL)
+        self._update_timer.timeout.connect(self._apply_pending_updates)
 
         self._opacity_slider = QSlider(Qt.Orientation.Horizontal, self)
         self._opacity_slider.setMinimum(0)
@@ -60,45 +70,27 @@ class ChannelControlsWidget(QWidget):
 
         @self._opacity_slider.valueChanged.connect
         def on_opacity_slider_value_changed(value: int):
-            for channel in self._controller.selected_channels:
-                channel.opacity = value / 100
+            self._schedule_update("opacity", value / 100)
 
         @self._contrast_range_slider.valueChanged.connect
         def on_contrast_range_slider_values_changed(values: Tuple[float, float]):
-            for channel in self._controller.selected_channels:
-                contrast_limits_range_min = min(
-                    (
-                        layer.contrast_limits_range[0]
-                        for layer in channel.shown_imc_file_acquisition_layers.values()
-                    ),
-                    default=values[0],
-                )
-                contrast_limits_range_max = max(
-                    (
-                        layer.contrast_limits_range[1]
-                        for layer in channel.shown_imc_file_acquisition_layers.values()
-                    ),
-                    default=values[1],
-                )
-                channel.contrast_limits = (
-                    max(values[0], contrast_limits_range_min),
-                    min(values[1], contrast_limits_range_max),
-                )
+            self._schedule_update("contrast_limits", values)
 
         @self._gamma_slider.valueChanged.connect
         def on_gamma_slider_value_changed(value: int):
-            for channel in self._controller.selected_channels:
-                channel.gamma = value / 100
+            self._schedule_update("gamma", value / 100)
 
         @self._color_picker.events.color_changed.connect
         def on_color_picker_color_changed(color: QColor):
-            for channel in self._controller.selected_channels:
-                channel.color = (
+            self._schedule_update(
+                "color",
+                (
                     color.red() / 255,
                     color.green() / 255,
                     color.blue() / 255,
                     color.alpha() / 255,
-                )
+                ),
+            )
 
         blending_combo_box_activated = self._blending_combo_box.activated[str]
 
@@ -117,6 +109,7 @@ class ChannelControlsWidget(QWidget):
         self.refresh()
 
     def refresh(self):
+        self._apply_pending_updates()
         channels = self._controller.selected_channels
         if len(channels) > 0:
             mean_opacity = sum(channel.opacity for channel in channels) / len(channels)
@@ -128,12 +121,12 @@ class ChannelControlsWidget(QWidget):
                 channel for channel in channels if channel.contrast_limits is not None
             ]
             if len(contrast_limits_channels) > 0:
-                layers = [
-                    layer
+                contrast_limits_ranges = [
+                    channel.contrast_limits_range
                     for channel in channels
-                    for layer in channel.shown_imc_file_acquisition_layers.values()
+                    if channel.contrast_limits_range is not None
                 ]
-                if len(layers) > 0:
+                if len(contrast_limits_ranges) > 0:
                     contrast_limits_min = min(
                         channel.contrast_limits[0]
                         for channel in contrast_limits_channels
@@ -143,10 +136,12 @@ class ChannelControlsWidget(QWidget):
                         for channel in contrast_limits_channels
                     )
                     contrast_limits_range_min = min(
-                        layer.contrast_limits_range[0] for layer in layers
+                        contrast_limits_range[0]
+                        for contrast_limits_range in contrast_limits_ranges
                     )
                     contrast_limits_range_max = max(
-                        layer.contrast_limits_range[1] for layer in layers
+                        contrast_limits_range[1]
+                        for contrast_limits_range in contrast_limits_ranges
                     )
                     contrast_limits_min = max(
                         contrast_limits_min, contrast_limits_range_min
@@ -186,3 +181,32 @@ class ChannelControlsWidget(QWidget):
             self._interpolation_combo_box.blockSignals(True)
             self._interpolation_combo_box.setCurrentIndex(index)
             self._interpolation_combo_box.blockSignals(False)
+
+    def _schedule_update(self, name: str, value: Any):
+        channels = tuple(dict.fromkeys(self._controller.selected_channels))
+        if channels != self._pending_update_channels:
+            self._apply_pending_updates()
+            self._pending_update_channels = channels
+        self._pending_updates[name] = value
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+
+    def _apply_pending_updates(self):
+        self._update_timer.stop()
+        updates, self._pending_updates = self._pending_updates, {}
+        for channel in self._pending_update_channels:
+            if "opacity" in updates:
+                channel.opacity = updates["opacity"]
+            if "contrast_limits" in updates:
+                contrast_limits = updates["contrast_limits"]
+                contrast_limits_range_min, contrast_limits_range_max = (
+                    channel.contrast_limits_range or contrast_limits
+                )
+                channel.contrast_limits = (
+                    max(contrast_limits[0], contrast_limits_range_min),
+                    min(contrast_limits[1], contrast_limits_range_max),
+                )
+            if "gamma" in updates:
+                channel.gamma = updates["gamma"]
+            if "color" in updates:
+                channel.color = updates["color"]
@@ -114,8 +114,15 @@ class IMCFileTreeModel(QAbstractItemModel):
 
     @contextmanager
     def append_imc_file(self):
+        with self.append_imc_files(1):
+            yield
+
+    @contextmanager
+    def append_imc_files(self, count: int):
         self.beginInsertRows(
-            self.createIndex(0, 0, self._controller), self.rowCount(), self.rowCount()
+            self.createIndex(0, 0, self._controller),
+            self.rowCount(),
+            self.rowCount() + count - 1,
         )
         yield
         self.endInsertRows()
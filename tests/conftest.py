@@ -0,0 +1,109 @@
+import io
+import os
+from pathlib import Path
+from typing import Dict, NamedTuple
+
+import numpy as np
+import pytest
+
+# Qt tests are run without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+MCD_SCHEMA_NAMESPACE = "http://www.fluidigm.com/IMC/MCDSchema_V2_0.xsd"
+
+
+class McdFile(NamedTuple):
+    path: Path
+    panorama: np.ndarray
+    acquisitions: Dict[int, np.ndarray]  # (c, y, x), rows stored top to bottom
+
+
+def _write_mcd_file(path: Path) -> McdFile:
+    # minimal MCD file with an imported panorama and two acquisitions
+    imageio = pytest.importorskip("imageio.v2")
+    rng = np.random.default_rng(0)
+    f = io.BytesIO()
+    panorama = (rng.random((30, 40, 3)) * 255).astype(np.uint8)
+    # image data is preceded by a 161-byte header and followed by one byte
+    panorama_start = f.tell()
+    f.write(bytes(161))
+    f.write(imageio.imwrite("<bytes>", panorama, format="png"))
+    f.write(bytes(1))
+    panorama_end = f.tell()
+    schema = [
+        f'<MCDSchema xmlns="{MCD_SCHEMA_NAMESPACE}">',
+        "<Slide><ID>0</ID><Description>Slide</Description></Slide>",
+        "<Panorama><ID>1</ID><SlideID>0</SlideID><Description>Panorama</Description>"
+        "<Type>Imported</Type>"
+        "<SlideX1PosUm>0</SlideX1PosUm><SlideY1PosUm>30</SlideY1PosUm>"
+        "<SlideX2PosUm>40</SlideX2PosUm><SlideY2PosUm>30</SlideY2PosUm>"
+        "<SlideX3PosUm>40</SlideX3PosUm><SlideY3PosUm>0</SlideY3PosUm>"
+        "<SlideX4PosUm>0</SlideX4PosUm><SlideY4PosUm>0</SlideY4PosUm>"
+        f"<ImageStartOffset>{panorama_start}</ImageStartOffset>"
+        f"<ImageEndOffset>{panorama_end}</ImageEndOffset></Panorama>",
+    ]
+    acquisitions = {}
+    for acquisition_id, width, height in ((1, 8, 6), (2, 5, 4)):
+        img = (rng.random((3, height, width)) * 100).astype(np.float32)
+        acquisitions[acquisition_id] = img
+        ys, xs = np.mgrid[:height, :width]
+        records = np.column_stack(
+            [xs.ravel(), ys.ravel(), np.zeros(width * height), img.reshape(3, -1).T]
+        ).astype(np.float32)
+        data_start = f.tell()
+        f.write(records.tobytes())
+        data_end = f.tell()
+        schema.append(
+            f"<AcquisitionROI><ID>{acquisition_id}</ID>"
+            "<PanoramaID>1</PanoramaID></AcquisitionROI>"
+        )
+        roi_points = [
+            (10, 20),
+            (10 + width, 20),
+            (10 + width, 20 - height),
+            (10, 20 - height),
+        ]
+        for i, (x, y) in enumerate(roi_points):
+            schema.append(
+                f"<ROIPoint><ID>{10 * acquisition_id + i}</ID>"
+                f"<AcquisitionROIID>{acquisition_id}</AcquisitionROIID>"
+                f"<OrderNumber>{i}</OrderNumber><SlideXPosUm>{x}</SlideXPosUm>"
+                f"<SlideYPosUm>{y}</SlideYPosUm></ROIPoint>"
+            )
+        schema.append(
+            f"<Acquisition><ID>{acquisition_id}</ID>"
+            f"<AcquisitionROIID>{acquisition_id}</AcquisitionROIID>"
+            f"<Description>Acquisition {acquisition_id}</Description>"
+            f"<DataStartOffset>{data_start}</DataStartOffset>"
+            f"<DataEndOffset>{data_end}</DataEndOffset><ValueBytes>4</ValueBytes>"
+            f"<MaxX>{width}</MaxX><MaxY>{height}</MaxY>"
+            "<AblationDistanceBetweenShotsX>1</AblationDistanceBetweenShotsX>"
+            "<AblationDistanceBetweenShotsY>1</AblationDistanceBetweenShotsY>"
+            "</Acquisition>"
+        )
+        channel_names = ["X", "Y", "Z", "Ir(191)", "Ir(193)", "Pt(195)"]
+        channel_labels = ["X", "Y", "Z", "DNA1", "DNA2", "Marker"]
+        for i, (channel_name, channel_label) in enumerate(
+            zip(channel_names, channel_labels)
+        ):
+            schema.append(
+                f"<AcquisitionChannel><ID>{100 * acquisition_id + i}</ID>"
+                f"<AcquisitionID>{acquisition_id}</AcquisitionID>"
+                f"<OrderNumber>{i}</OrderNumber>"
+                f"<ChannelName>{channel_name}</ChannelName>"
+                f"<ChannelLabel>{channel_label}</ChannelLabel></AcquisitionChannel>"
+            )
+    schema.append("</MCDSchema>")
+    f.write("".join(schema).encode("utf-16-le"))
+    path.write_bytes(f.getvalue())
+    return McdFile(path, panorama, acquisitions)
+
+
+@pytest.fixture
+def mcd_file(tmp_path) -> McdFile:
+    return _write_mcd_file(tmp_path / "file.mcd")
+
+
+@pytest.fixture
+def write_mcd_file():
+    return _write_mcd_file
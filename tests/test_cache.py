@@ -0,0 +1,56 @@
+import numpy as np
+
+from napari_imc.io.base import ImageDimensions
+from napari_imc.io.cache import ImageCache
+from napari_imc.memory import MemoryBudget
+
+DIMS = ImageDimensions(0.0, 0.0, 10.0, 10.0)
+
+
+def _create_entry(nbytes: int):
+    return DIMS, np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path):
+    path = tmp_path / "file.mcd"
+    image_cache = ImageCache(max_bytes=200)
+    image_cache.put(path, 1, _create_entry(100))
+    image_cache.put(path, 2, _create_entry(100))
+    assert image_cache.get(path, 1) is not None
+    image_cache.put(path, 3, _create_entry(100))
+    assert image_cache.get(path, 2) is None
+    assert image_cache.get(path, 1) is not None
+    assert image_cache.get(path, 3) is not None
+    assert image_cache.nbytes == 200
+
+
+def test_image_cache_skips_oversized_entries(tmp_path):
+    image_cache = ImageCache(max_bytes=100)
+    image_cache.put(tmp_path, 1, _create_entry(101))
+    assert len(image_cache) == 0
+    assert image_cache.nbytes == 0
+
+
+def test_image_cache_invalidate(tmp_path):
+    image_cache = ImageCache(max_bytes=1000)
+    image_cache.put(tmp_path / "a.mcd", 1, _create_entry(100))
+    image_cache.put(tmp_path / "b.mcd", 1, _create_entry(100))
+    image_cache.invalidate(tmp_path / "a.mcd")
+    assert image_cache.get(tmp_path / "a.mcd", 1) is None
+    assert image_cache.get(tmp_path / "b.mcd", 1) is not None
+    assert image_cache.nbytes == 100
+
+
+def test_image_cache_evicted_by_memory_budget(tmp_path):
+    memory_budget = MemoryBudget(max_bytes=150)
+    image_cache = ImageCache(max_bytes=1000, memory_budget=memory_budget)
+    image_cache.put(tmp_path, 1, _create_entry(100))
+    image_cache.put(tmp_path, 2, _create_entry(100))
+    assert memory_budget.nbytes == 200
+    memory_budget.enforce()
+    assert image_cache.get(tmp_path, 1) is None
+    assert image_cache.get(tmp_path, 2) is not None
+    assert memory_budget.nbytes == image_cache.nbytes == 100
+    image_cache.clear()
+    assert len(memory_budget) == 0
+    assert memory_budget.nbytes == 0
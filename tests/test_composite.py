@@ -0,0 +1,40 @@
+import numpy as np
+
+from napari_imc.composite import AcquisitionComposite
+from napari_imc.models import ChannelModel
+
+
+def test_acquisition_composite_add_remove_channels():
+    rng = np.random.default_rng(0)
+    channel1 = ChannelModel("Ch1", color=(1.0, 0.0, 0.0, 1.0))
+    channel2 = ChannelModel("Ch2", color=(0.0, 1.0, 1.0, 1.0))
+    channel1.contrast_limits = (0.0, 0.5)
+    channel2.contrast_limits = (0.0, 1.0)
+    data1 = rng.uniform(size=(10, 20)).astype(np.float32)
+    data2 = rng.uniform(size=(10, 20)).astype(np.float32)
+    composite = AcquisitionComposite(10, 20)
+    composite.add_channel(channel1, data1)
+    rgb1 = composite.rgb
+    composite.add_channel(channel2, data2)
+    assert composite.channels == (channel1, channel2)
+    np.testing.assert_allclose(composite.rgb[:, :, 0], rgb1[:, :, 0])
+    np.testing.assert_allclose(composite.rgb[:, :, 1], data2, atol=1e-6)
+    composite.remove_channel(channel2)
+    np.testing.assert_allclose(composite.rgb, rgb1, atol=1e-6)
+    composite.remove_channel(channel1)
+    assert composite.channels == ()
+    assert not composite.rgb.any()
+
+
+def test_acquisition_composite_update_channel():
+    channel = ChannelModel("Ch1", color=(1.0, 1.0, 1.0, 1.0))
+    channel.contrast_limits = (0.0, 1.0)
+    data = np.full((5, 5), 0.5, dtype=np.float32)
+    composite = AcquisitionComposite(5, 5)
+    composite.add_channel(channel, data)
+    channel.opacity = 0.5
+    composite.update_channel(channel)
+    np.testing.assert_allclose(composite.rgb, 0.25)
+    channel.contrast_limits = (0.0, 0.5)
+    composite.update_channel(channel)
+    np.testing.assert_allclose(composite.rgb, 0.5)
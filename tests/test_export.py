@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from napari_imc.export import _find_imc_files, export_imc_file, main
+
+
+def _read_image(output_path: Path, export_format: str):
+    if export_format == "ome-tiff":
+        tifffile = pytest.importorskip("tifffile")
+        with tifffile.TiffFile(
+            output_path.with_name(output_path.name + ".ome.tiff")
+        ) as f:
+            return f.asarray(), f.ome_metadata
+    if export_format == "zarr":
+        zarr = pytest.importorskip("zarr")
+        img = zarr.open_array(str(output_path.with_name(output_path.name + ".zarr")))
+        return img[:], dict(img.attrs)
+    img = np.load(output_path.with_name(output_path.name + ".npy"))
+    with output_path.with_name(output_path.name + ".json").open() as f:
+        return img, json.load(f)
+
+
+@pytest.mark.parametrize("export_format", ["ome-tiff", "zarr", "npy"])
+def test_export_imc_file(tmp_path, mcd_file, export_format):
+    if export_format != "npy":
+        pytest.importorskip("tifffile" if export_format == "ome-tiff" else "zarr")
+    result = export_imc_file(mcd_file.path, tmp_path / "out", export_format)
+    assert result.error is None
+    assert result.num_images == 3
+    # images are exported with their rows stored top to bottom
+    img, metadata = _read_image(tmp_path / "out" / "file_P01", export_format)
+    assert np.array_equal(img, mcd_file.panorama[::-1])
+    for acquisition_id, acquisition_img in mcd_file.acquisitions.items():
+        img, metadata = _read_image(
+            tmp_path / "out" / f"file_A{acquisition_id:02d}", export_format
+        )
+        assert np.array_equal(img, acquisition_img[:, ::-1])
+        if export_format == "ome-tiff":
+            assert 'Name="Marker"' in metadata
+        else:
+            assert metadata["axes"] == "CYX"
+            assert metadata["channel_labels"] == ["DNA1", "DNA2", "Marker"]
+            assert metadata["dims"][4:] == [0.0, False, False]
+
+
+def test_export_imc_file_overwrite(tmp_path, mcd_file):
+    export_imc_file(mcd_file.path, tmp_path, "npy", panoramas=False)
+    with pytest.raises(FileExistsError):
+        export_imc_file(mcd_file.path, tmp_path, "npy", panoramas=False)
+    result = export_imc_file(
+        mcd_file.path, tmp_path, "npy", panoramas=False, overwrite=True
+    )
+    assert result.num_images == 2
+
+
+def test_find_imc_files(tmp_path, write_mcd_file):
+    for name in ("a", "b"):
+        (tmp_path / "in" / name).mkdir(parents=True)
+        write_mcd_file(tmp_path / "in" / name / "file.mcd")
+    (tmp_path / "in" / "file.txt").write_text("other")
+    assert _find_imc_files([tmp_path / "in"]) == [
+        (tmp_path / "in" / "a" / "file.mcd", Path("a") / "file"),
+        (tmp_path / "in" / "b" / "file.mcd", Path("b") / "file"),
+    ]
+    assert _find_imc_files([tmp_path / "in" / "a" / "file.mcd"]) == [
+        (tmp_path / "in" / "a" / "file.mcd", Path("file"))
+    ]
+
+
+def test_main(tmp_path, write_mcd_file):
+    for name in ("a", "b"):
+        (tmp_path / "in" / name).mkdir(parents=True)
+        write_mcd_file(tmp_path / "in" / name / "file.mcd")
+    argv = [str(tmp_path / "in"), "-o", str(tmp_path / "out"), "-f", "npy", "-j", "1"]
+    assert main(argv) == 0
+    for name in ("a", "b"):
+        assert (tmp_path / "out" / name / "file_A01.npy").is_file()
+        assert (tmp_path / "out" / name / "file_P01.npy").is_file()
+    assert main(argv) == 1
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "in" / "a"), str(tmp_path / "in" / "b"), "-o", "out"])
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from napari_imc.io import ImaxtFileReader
+
+zarr = pytest.importorskip("zarr")
+imageio = pytest.importorskip("imageio.v2")
+
+ACQUISITION = np.arange(3 * 6 * 8, dtype=np.float32).reshape(3, 6, 8)
+PANORAMA = np.zeros((20, 30, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "imaxt"
+    zarr_group = zarr.open_group(str(path), mode="w")
+    # channels are stored in a different order than acquired
+    acquisition_group = zarr_group.create_group("Q001")
+    acquisition_group.create_dataset(
+        "Q001", data=ACQUISITION[[2, 0, 1]], chunks=(1, 3, 4)
+    )
+    acquisition_group.create_dataset("channel", data=np.array([2, 0, 1]))
+    imageio.imwrite(path / "panorama.png", PANORAMA)
+    (path / "mcd_schema.xml").touch()
+    zarr_group.attrs["meta"] = {
+        "scan_type": "IMC",
+        "panoramas": [
+            {
+                "id": 1,
+                "type": "Imported",
+                "description": "Panorama",
+                "file": "panorama.png",
+                "slide_pos_um": [[0, 100], [30, 100], [30, 80], [0, 80]],
+            }
+        ],
+        "acquisitions": [
+            {
+                "id": 1,
+                "description": "Acquisition",
+                "group": "Q001",
+                "channels": [{"target": f"Target{i}"} for i in range(3)],
+                "roi_start_pos_um": [5000, 70000],
+                "roi_end_pos_um": [13, 64],
+            }
+        ],
+    }
+    return path
+
+
+def test_imaxt_file_reader_accepts(path, tmp_path):
+    assert ImaxtFileReader.accepts(path)
+    assert ImaxtFileReader.accepts(path / "mcd_schema.xml")
+    zarr.open_group(str(tmp_path / "other"), mode="w")
+    assert not ImaxtFileReader.accepts(tmp_path / "other")
+    assert not ImaxtFileReader.accepts(tmp_path / "file.mcd")
+
+
+def test_imaxt_file_reader_get_imc_file(path):
+    with ImaxtFileReader(path / "mcd_schema.xml") as f:
+        imc_file = f.get_imc_file(None)
+    assert imc_file.path == path
+    assert [panorama.id for panorama in imc_file.panoramas] == [1]
+    assert [acquisition.id for acquisition in imc_file.acquisitions] == [1]
+    assert imc_file.acquisitions[0].channel_labels == ["Target0", "Target1", "Target2"]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_imaxt_file_reader_read_acquisition(path, lazy):
+    with ImaxtFileReader(path, lazy=lazy) as f:
+        dims, img = f.read_acquisition_stack(1)
+        assert np.array_equal(np.asarray(img), ACQUISITION)
+        assert dims == (5.0, 64.0, 8.0, 6.0, 0.0, True, False)
+        dims, img = f.read_acquisition(1, "Target2")
+        assert np.array_equal(np.asarray(img), ACQUISITION[2])
+
+
+def test_imaxt_file_reader_read_panorama(path):
+    with ImaxtFileReader(path) as f:
+        dims, img = f.read_panorama(1)
+    assert np.array_equal(img, PANORAMA)
+    assert dims[:4] == (0.0, 80.0, 30.0, 20.0)
+    assert dims.flip_y
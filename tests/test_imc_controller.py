@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+
+from napari_imc.io import FileReaderRegistry, McdFileReader, TxtFileReader
+
+pytest.importorskip("napari")
+
+from napari.components import ViewerModel  # noqa: E402
+from napari.layers import Image  # noqa: E402
+
+from napari_imc import imc_controller  # noqa: E402
+from napari_imc.imc_controller import IMCController  # noqa: E402
+from napari_imc.imc_widget import IMCWidget  # noqa: E402
+from napari_imc.io.base import ImageDimensions  # noqa: E402
+
+
+@pytest.fixture
+def controller(qtbot):
+    # layer bookkeeping does not require a canvas
+    widget = IMCWidget(ViewerModel())
+    qtbot.addWidget(widget)
+    return widget.controller
+
+
+@pytest.fixture
+def file_reader_registry(monkeypatch):
+    file_reader_registry = FileReaderRegistry([McdFileReader])
+    monkeypatch.setattr(
+        imc_controller, "get_file_reader_registry", lambda: file_reader_registry
+    )
+    IMCController._find_file_reader_type.cache_clear()
+    yield file_reader_registry
+    IMCController._find_file_reader_type.cache_clear()
+
+
+@pytest.fixture
+def probed_paths(monkeypatch):
+    probed_paths = []
+    probe_file_reader_type = IMCController._probe_file_reader_type.__func__
+
+    def _probe_file_reader_type(cls, path):
+        probed_paths.append(path)
+        return probe_file_reader_type(cls, path)
+
+    monkeypatch.setattr(
+        IMCController, "_probe_file_reader_type", classmethod(_probe_file_reader_type)
+    )
+    return probed_paths
+
+
+def test_is_imc_file(tmp_path, file_reader_registry, probed_paths):
+    path = tmp_path / "file.mcd"
+    path.write_bytes(b"\0")
+    assert IMCController.is_imc_file(path)
+    assert IMCController.is_imc_file(path)
+    assert len(probed_paths) == 1
+    assert not IMCController.is_imc_file(tmp_path / "missing.mcd")
+    assert len(probed_paths) == 1
+
+
+def test_is_imc_file_modified(tmp_path, file_reader_registry, probed_paths):
+    path = tmp_path / "file.mcd"
+    path.write_bytes(b"\0")
+    assert IMCController.is_imc_file(path)
+    path.write_bytes(b"\0\0")
+    assert IMCController.is_imc_file(path)
+    assert len(probed_paths) == 2
+
+
+def test_is_imc_file_registry_changed(tmp_path, file_reader_registry, probed_paths):
+    path = tmp_path / "file.txt"
+    path.write_bytes(TxtFileReader.MAGIC)
+    assert not IMCController.is_imc_file(path)
+    file_reader_registry.register(TxtFileReader)
+    assert IMCController.is_imc_file(path)
+    assert len(probed_paths) == 2
+
+
+def _create_layer(name, layer_type=None):
+    metadata = {layer_type: True} if layer_type is not None else {}
+    return Image(np.zeros((2, 2)), name=name, metadata=metadata)
+
+
+def _assert_layer_indices(controller):
+    for layer_type in (
+        IMCController.PANORAMA_LAYER_TYPE,
+        IMCController.ACQUISITION_LAYER_TYPE,
+    ):
+        assert controller._get_layer_indices(layer_type) == [
+            i
+            for i, layer in enumerate(controller.viewer.layers)
+            if layer.metadata.get(layer_type, False)
+        ]
+
+
+def test_layer_indices(controller):
+    layers = controller.viewer.layers
+    layers.append(_create_layer("other"))
+    _assert_layer_indices(controller)
+    controller._insert_layers(
+        controller._get_next_acquisition_layer_index(),
+        [
+            _create_layer(f"acquisition{i}", IMCController.ACQUISITION_LAYER_TYPE)
+            for i in range(3)
+        ],
+    )
+    controller._insert_layers(
+        controller._get_next_panorama_layer_index(),
+        [_create_layer("panorama", IMCController.PANORAMA_LAYER_TYPE)],
+    )
+    assert [layer.name for layer in layers] == [
+        "panorama",
+        "other",
+        "acquisition0",
+        "acquisition1",
+        "acquisition2",
+    ]
+    _assert_layer_indices(controller)
+    layers.insert(2, _create_layer("other2"))
+    _assert_layer_indices(controller)
+    layers.move(0, 4)
+    _assert_layer_indices(controller)
+    # layer indices are updated incrementally
+    assert controller._layer_indices is not None
+    layers.remove("acquisition1")
+    _assert_layer_indices(controller)
+    layers.reverse()
+    _assert_layer_indices(controller)
+
+
+@pytest.mark.parametrize("flip_y,flip_x", [(True, False), (False, True), (True, True)])
+def test_get_layer_transform(flip_y, flip_x):
+    dims = ImageDimensions(10.0, 20.0, 8.0, 12.0, rotation=0.5)
+    shape = (6, 4)
+    affine = IMCController._get_layer_transform(dims, shape)["affine"]
+    flipped_affine = IMCController._get_layer_transform(
+        dims._replace(flip_y=flip_y, flip_x=flip_x), shape
+    )["affine"]
+    # stored pixels are displayed at the locations of the unflipped pixels
+    for y, x in np.ndindex(*shape):
+        flipped_y = shape[0] - 1 - y if flip_y else y
+        flipped_x = shape[1] - 1 - x if flip_x else x
+        np.testing.assert_allclose(
+            flipped_affine @ [y, x, 1], affine @ [flipped_y, flipped_x, 1]
+        )
@@ -0,0 +1,127 @@
+import numpy as np
+
+from napari_imc.io import McdFileReader
+from napari_imc.io.mcd import _read_acquisition_rows
+
+WIDTH = 4
+HEIGHT = 3
+NUM_CHANNELS = 2
+NUM_VALUES = NUM_CHANNELS + 3
+DATA_OFFSET = 7
+
+
+def _write_acquisition(path, num_pixels=WIDTH * HEIGHT):
+    # pixel records (X, Y, Z, channels...) in row-major order, after a header
+    ys, xs = np.divmod(np.arange(num_pixels), WIDTH)
+    records = np.zeros((num_pixels, NUM_VALUES), dtype=np.float32)
+    records[:, 0] = xs
+    records[:, 1] = ys
+    records[:, 3] = ys * WIDTH + xs
+    records[:, 4] = -(ys * WIDTH + xs)
+    with path.open("wb") as f:
+        f.write(b"\xff" * DATA_OFFSET)
+        f.write(records.tobytes())
+    expected = np.zeros((NUM_CHANNELS, HEIGHT, WIDTH), dtype=np.float32)
+    expected.reshape(NUM_CHANNELS, -1)[0, :num_pixels] = np.arange(num_pixels)
+    expected.reshape(NUM_CHANNELS, -1)[1, :num_pixels] = -np.arange(num_pixels)
+    return expected
+
+
+def test_read_acquisition_rows(tmp_path):
+    path = tmp_path / "acquisition.dat"
+    expected = _write_acquisition(path)
+    num_pixels = WIDTH * HEIGHT
+    img = _read_acquisition_rows(
+        path, DATA_OFFSET, NUM_VALUES, num_pixels, WIDTH, 0, HEIGHT, [0, 1]
+    )
+    np.testing.assert_array_equal(img, expected)
+    img = _read_acquisition_rows(
+        path, DATA_OFFSET, NUM_VALUES, num_pixels, WIDTH, 1, 3, [1]
+    )
+    np.testing.assert_array_equal(img, expected[[1], 1:3])
+
+
+def test_read_acquisition_rows_out(tmp_path):
+    path = tmp_path / "acquisition.dat"
+    expected = _write_acquisition(path)
+    out = np.full((1, HEIGHT, WIDTH), np.nan, dtype=np.float32)
+    _read_acquisition_rows(
+        path, DATA_OFFSET, NUM_VALUES, WIDTH * HEIGHT, WIDTH, 0, 2, [0], out=out[:, :2]
+    )
+    np.testing.assert_array_equal(out[:, :2], expected[[0], :2])
+    assert np.isnan(out[:, 2]).all()
+
+
+def test_read_acquisition_rows_incomplete(tmp_path):
+    # acquisitions that were aborted have fewer pixel records than pixels
+    path = tmp_path / "acquisition.dat"
+    expected = _write_acquisition(path, num_pixels=6)
+    img = _read_acquisition_rows(
+        path, DATA_OFFSET, NUM_VALUES, 6, WIDTH, 0, HEIGHT, [0, 1]
+    )
+    np.testing.assert_array_equal(img, expected)
+
+
+def test_read_acquisition_rows_truncated(tmp_path):
+    # truncated files have fewer pixel records than stated
+    path = tmp_path / "acquisition.dat"
+    expected = _write_acquisition(path, num_pixels=6)
+    with path.open("ab") as f:
+        f.write(b"\0" * 6)
+    img = _read_acquisition_rows(
+        path, DATA_OFFSET, NUM_VALUES, WIDTH * HEIGHT, WIDTH, 0, HEIGHT, [0, 1]
+    )
+    np.testing.assert_array_equal(img, expected)
+
+
+def test_read_acquisition_channels(mcd_file):
+    with McdFileReader(mcd_file.path) as f:
+        for acquisition_id, img in mcd_file.acquisitions.items():
+            dims, channels_img = f._read_acquisition_channels(acquisition_id, [2, 0])
+            np.testing.assert_array_equal(channels_img, img[[2, 0]])
+            assert dims == f.read_acquisition_stack(acquisition_id)[0]
+
+
+def test_iter_acquisition_channels_streaming(mcd_file, monkeypatch):
+    monkeypatch.setattr(McdFileReader, "ACQUISITION_CHANNEL_BATCH_SIZE", 2)
+    with McdFileReader(mcd_file.path, streaming=True) as f:
+        # the full stack is never read when streaming
+        monkeypatch.setattr(f, "_read_acquisition_stack", None)
+        channels = list(f.iter_acquisition_channels(1))
+        assert [channel_label for channel_label, _, _ in channels] == [
+            "DNA1",
+            "DNA2",
+            "Marker",
+        ]
+        for i, (_, _, channel_img) in enumerate(channels):
+            np.testing.assert_array_equal(channel_img, mcd_file.acquisitions[1][i])
+        _, _, channel_img = next(f.iter_acquisition_channels(2, ["Marker"]))
+        np.testing.assert_array_equal(channel_img, mcd_file.acquisitions[2][2])
+
+
+def test_read_acquisition_stack_memmap(mcd_file):
+    with McdFileReader(mcd_file.path) as f, McdFileReader(
+        mcd_file.path, memmap=True
+    ) as memmap_f:
+        for acquisition_id, img in mcd_file.acquisitions.items():
+            dims, memmap_img = memmap_f.read_acquisition_stack(acquisition_id)
+            assert isinstance(memmap_img.base, np.memmap)
+            np.testing.assert_array_equal(memmap_img, img)
+            assert dims == f.read_acquisition_stack(acquisition_id)[0]
+
+
+def test_read_acquisition_stack_memmap_unordered(mcd_file):
+    with McdFileReader(mcd_file.path) as f:
+        data_offset = f._get_acquisition_info(1).data_offset
+    # pixel records that are not in row-major order are not memory-mapped
+    record_size = (3 + 3) * 4
+    with mcd_file.path.open("r+b") as fh:
+        fh.seek(data_offset)
+        records = fh.read(2 * record_size)
+        fh.seek(data_offset)
+        fh.write(records[record_size:] + records[:record_size])
+    with McdFileReader(mcd_file.path, memmap=True) as f:
+        assert f._read_acquisition_stack_memmap(1) is None
+        np.testing.assert_array_equal(
+            f.read_acquisition_stack(1)[1], mcd_file.acquisitions[1]
+        )
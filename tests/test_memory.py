@@ -0,0 +1,91 @@
+import numpy as np
+
+from napari_imc.memory import MemoryBudget
+
+
+def test_memory_budget_evicts_least_recently_used_evictable_entries():
+    evicted = []
+    memory_budget = MemoryBudget(max_bytes=250)
+    for key in ("a", "b", "c", "d"):
+        memory_budget.add(
+            key,
+            np.zeros(100, dtype=np.uint8),
+            lambda key=key: evicted.append(key),
+            evictable=key != "a",
+        )
+    memory_budget.touch("b")
+    memory_budget.enforce()
+    assert evicted == ["c", "d"]
+    assert "a" in memory_budget
+    assert "b" in memory_budget
+    assert memory_budget.nbytes == 200
+
+
+def test_memory_budget_set_evictable():
+    evicted = []
+    memory_budget = MemoryBudget(max_bytes=100)
+    memory_budget.add("a", np.zeros(100, dtype=np.uint8), lambda: evicted.append("a"))
+    memory_budget.add("b", np.zeros(100, dtype=np.uint8), lambda: evicted.append("b"))
+    memory_budget.enforce()
+    assert evicted == []
+    memory_budget.set_evictable("b", True)
+    memory_budget.set_evictable("a", True)
+    memory_budget.enforce()
+    assert evicted == ["b"]
+
+
+def test_memory_budget_counts_shared_buffers_once():
+    memory_budget = MemoryBudget()
+    stack = np.zeros((4, 10, 10), dtype=np.float32)
+    memory_budget.add("stack", stack, lambda: None)
+    memory_budget.add("channel0", stack[0], lambda: None)
+    memory_budget.add("channel1", stack[1], lambda: None)
+    assert memory_budget.nbytes == stack.nbytes
+    memory_budget.remove("stack")
+    memory_budget.remove("channel0")
+    assert memory_budget.nbytes == stack.nbytes
+    memory_budget.remove("channel1")
+    assert memory_budget.nbytes == 0
+
+
+def test_memory_budget_ignores_memory_mapped_data(tmp_path):
+    memory_budget = MemoryBudget()
+    img = np.memmap(tmp_path / "img.dat", dtype=np.float32, mode="w+", shape=(10,))
+    assert not memory_budget.add("img", img[2:], lambda: None)
+    assert not memory_budget.add("other", object(), lambda: None)
+    assert memory_budget.nbytes == 0
+    assert len(memory_budget) == 0
+
+
+def test_memory_budget_keeps_buffers_shared_with_pinned_entries():
+    evicted = []
+    memory_budget = MemoryBudget(max_bytes=100)
+    stack = np.zeros((2, 100), dtype=np.uint8)
+    memory_budget.add(
+        "cached", stack, lambda: evicted.append("cached"), evictable=True, priority=1
+    )
+    memory_budget.add("visible", stack[0], lambda: evicted.append("visible"))
+    memory_budget.add(
+        "hidden", stack[1], lambda: evicted.append("hidden"), evictable=True
+    )
+    memory_budget.enforce()
+    assert evicted == []
+    assert memory_budget.nbytes == stack.nbytes
+
+
+def test_memory_budget_evicts_shared_entries_by_priority():
+    evicted = []
+    memory_budget = MemoryBudget(max_bytes=100)
+    stack = np.zeros((2, 100), dtype=np.uint8)
+    memory_budget.add(
+        "cached", stack, lambda: evicted.append("cached"), evictable=True, priority=1
+    )
+    memory_budget.add(
+        "hidden1", stack[0], lambda: evicted.append("hidden1"), evictable=True
+    )
+    memory_budget.add(
+        "hidden2", stack[1], lambda: evicted.append("hidden2"), evictable=True
+    )
+    memory_budget.enforce()
+    assert evicted == ["hidden1", "hidden2", "cached"]
+    assert memory_budget.nbytes == 0
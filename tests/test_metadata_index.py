@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from napari_imc.io import McdFileReader
+from napari_imc.io.metadata_index import MetadataIndex
+
+
+@pytest.fixture
+def metadata_index(tmp_path):
+    metadata_index = MetadataIndex(tmp_path / "index" / "metadata.sqlite")
+    yield metadata_index
+    metadata_index.close()
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "file.mcd"
+    path.write_bytes(b"\0" * 16)
+    return path
+
+
+def test_metadata_index(metadata_index, path):
+    assert metadata_index.get(path) is None
+    metadata_index.put(path, {"acquisitions": [[1, "ROI", ["DNA"]]]})
+    assert metadata_index.get(path) == {"acquisitions": [[1, "ROI", ["DNA"]]]}
+    metadata_index.put_acquisition_statistics(path, 1, [[0.0, 1.0]])
+    assert metadata_index.get_acquisition_statistics(path, 1) == [[0.0, 1.0]]
+    assert metadata_index.get_acquisition_statistics(path, 2) is None
+
+
+def test_metadata_index_invalidated_on_size_change(metadata_index, path):
+    metadata_index.put(path, {})
+    metadata_index.put_acquisition_statistics(path, 1, [])
+    stat_result = path.stat()
+    path.write_bytes(b"\0" * 32)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns))
+    assert metadata_index.get(path) is None
+    assert metadata_index.get_acquisition_statistics(path, 1) is None
+
+
+def test_metadata_index_invalidated_on_mtime_change(metadata_index, path):
+    metadata_index.put(path, {})
+    metadata_index.put_acquisition_statistics(path, 1, [])
+    stat_result = path.stat()
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+    assert metadata_index.get(path) is None
+    assert metadata_index.get_acquisition_statistics(path, 1) is None
+
+
+def test_metadata_index_invalidate(metadata_index, path):
+    metadata_index.put(path, {})
+    metadata_index.invalidate(path)
+    assert metadata_index.get(path) is None
+
+
+def test_metadata_index_version(metadata_index, path, monkeypatch):
+    metadata_index.put(path, {})
+    monkeypatch.setattr(MetadataIndex, "VERSION", MetadataIndex.VERSION + 1)
+    assert metadata_index.get(path) is None
+
+
+def test_mcd_file_reader_metadata_index(metadata_index, mcd_file):
+    with McdFileReader(mcd_file.path, metadata_index=metadata_index) as f:
+        imc_file = f.get_imc_file(None)
+    assert metadata_index.get(mcd_file.path) is not None
+    # file readers created for indexed files do not parse the schema
+    with McdFileReader(mcd_file.path, metadata_index=metadata_index) as f:
+        assert f._get_acquisition_channel_labels(1) == ["DNA1", "DNA2", "Marker"]
+        indexed_imc_file = f.get_imc_file(None)
+        assert f._mcd_file is None
+    assert [
+        (panorama.id, panorama.image_type, panorama.description)
+        for panorama in indexed_imc_file.panoramas
+    ] == [
+        (panorama.id, panorama.image_type, panorama.description)
+        for panorama in imc_file.panoramas
+    ]
+    assert [
+        (acquisition.id, acquisition.description, acquisition.channel_labels)
+        for acquisition in indexed_imc_file.acquisitions
+    ] == [
+        (acquisition.id, acquisition.description, acquisition.channel_labels)
+        for acquisition in imc_file.acquisitions
+    ]
@@ -0,0 +1,117 @@
+from threading import Event, Thread
+
+import pytest
+
+from napari_imc.io.base import FileReaderBase
+from napari_imc.io.pool import FileReaderPool
+from napari_imc.models import IMCFileModel
+
+
+class _FileReader(FileReaderBase):
+    def _get_imc_file_panoramas(self, imc_file):
+        return []
+
+    def _get_imc_file_acquisitions(self, imc_file):
+        return []
+
+    def _read_acquisition_stack(self, acquisition_id):
+        raise NotImplementedError()
+
+    def _get_acquisition_channel_labels(self, acquisition_id):
+        return []
+
+    def __enter__(self) -> "_FileReader":
+        self.closed = False
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.closed = True
+
+
+class _ThreadSafeFileReader(_FileReader):
+    CAPABILITIES = FileReaderBase.Capability.THREAD_SAFE
+
+
+@pytest.fixture
+def imc_files(tmp_path):
+    imc_files = []
+    for i in range(3):
+        path = tmp_path / f"file{i}.txt"
+        path.touch()
+        imc_files.append(IMCFileModel(path, None))
+    return imc_files
+
+
+def test_file_reader_pool_reuses_file_readers(imc_files):
+    pool = FileReaderPool()
+    with pool.open(imc_files[0], _FileReader) as f1:
+        pass
+    with pool.open(imc_files[0], _FileReader) as f2:
+        pass
+    assert f1 is f2
+    assert not f1.closed
+    assert len(pool) == 1
+    pool.close_all()
+    assert f1.closed
+    assert len(pool) == 0
+
+
+def test_file_reader_pool_closes_least_recently_used(imc_files):
+    pool = FileReaderPool(max_size=2)
+    file_readers = []
+    for imc_file in imc_files:
+        with pool.open(imc_file, _FileReader) as f:
+            file_readers.append(f)
+    assert len(pool) == 2
+    assert [f.closed for f in file_readers] == [True, False, False]
+
+
+def test_file_reader_pool_keeps_file_readers_in_use(imc_files):
+    pool = FileReaderPool(max_size=1)
+    with pool.open(imc_files[0], _FileReader) as f1:
+        with pool.open(imc_files[1], _FileReader) as f2:
+            assert len(pool) == 2
+            assert not f1.closed
+        with pool.open(imc_files[2], _FileReader) as f3:
+            assert f2.closed
+            assert not f1.closed
+    assert not f3.closed
+
+
+def test_file_reader_pool_closes_idle_file_readers(imc_files):
+    pool = FileReaderPool(idle_timeout=0.0)
+    with pool.open(imc_files[0], _FileReader) as f:
+        pool.close_idle()
+        assert not f.closed
+    pool.close_idle()
+    assert f.closed
+    assert len(pool) == 0
+
+
+def test_file_reader_pool_rejects_deleted_files(imc_files):
+    pool = FileReaderPool()
+    imc_files[0].mark_deleted()
+    with pytest.raises(IOError):
+        with pool.open(imc_files[0], _FileReader):
+            pass
+    assert len(pool) == 0
+
+
+@pytest.mark.parametrize(
+    "file_reader_type,concurrent",
+    [(_FileReader, False), (_ThreadSafeFileReader, True)],
+)
+def test_file_reader_pool_concurrency(imc_files, file_reader_type, concurrent):
+    pool = FileReaderPool()
+    entered = Event()
+
+    def read():
+        with pool.open(imc_files[0], file_reader_type):
+            entered.set()
+
+    with pool.open(imc_files[0], file_reader_type):
+        thread = Thread(target=read)
+        thread.start()
+        assert entered.wait(timeout=0.5) == concurrent
+    thread.join(timeout=5.0)
+    assert entered.is_set()
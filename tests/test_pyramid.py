@@ -0,0 +1,42 @@
+import numpy as np
+
+from napari_imc.io import McdFileReader
+from napari_imc.io.pyramid import create_image_pyramid, downsample_image
+
+
+def test_downsample_image():
+    img = np.arange(20, dtype=np.float32).reshape(4, 5)
+    downsampled_img = downsample_image(img)
+    assert downsampled_img.dtype == np.float32
+    assert np.array_equal(downsampled_img, [[3.0, 5.0], [13.0, 15.0]])
+
+
+def test_downsample_image_rgb():
+    img = np.full((5, 4, 3), 255, dtype=np.uint8)
+    img[0, 0] = 0
+    downsampled_img = downsample_image(img)
+    assert downsampled_img.shape == (2, 2, 3)
+    assert downsampled_img.dtype == np.uint8
+    assert np.array_equal(downsampled_img[0, 0], [191, 191, 191])
+    assert np.all(downsampled_img.reshape(-1, 3)[1:] == 255)
+
+
+def test_create_image_pyramid():
+    img = np.zeros((100, 30, 3), dtype=np.uint8)
+    pyramid = create_image_pyramid(img, min_size=25)
+    assert pyramid[0] is img
+    assert [level.shape[:2] for level in pyramid] == [(100, 30), (50, 15), (25, 7)]
+
+
+def test_create_image_pyramid_small_image():
+    img = np.zeros((10, 10), dtype=np.uint8)
+    assert len(create_image_pyramid(img, min_size=10)) == 1
+
+
+def test_read_panorama_pyramid(mcd_file, monkeypatch):
+    monkeypatch.setattr(McdFileReader, "PANORAMA_PYRAMID_MIN_SIZE", 10)
+    with McdFileReader(mcd_file.path) as f:
+        dims, pyramid = f.read_panorama_pyramid(1)
+    assert [level.shape for level in pyramid] == [(30, 40, 3), (15, 20, 3), (7, 10, 3)]
+    assert np.array_equal(pyramid[0], mcd_file.panorama)
+    assert dims[:4] == (0.0, 0.0, 40.0, 30.0)
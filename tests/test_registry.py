@@ -0,0 +1,65 @@
+from pathlib import Path
+from typing import Union
+
+import pytest
+
+from napari_imc.io import (
+    FileReaderRegistry,
+    ImaxtFileReader,
+    McdFileReader,
+    TxtFileReader,
+)
+from napari_imc.io.base import FileReaderBase
+
+
+class _McdFileReader(McdFileReader):
+    CAPABILITIES = FileReaderBase.Capability.NONE
+
+    @classmethod
+    def accepts(cls, path: Union[str, Path]) -> bool:
+        return Path(path).name.startswith("custom")
+
+
+def test_file_reader_registry_find():
+    file_reader_registry = FileReaderRegistry(
+        [ImaxtFileReader, McdFileReader, TxtFileReader]
+    )
+    assert file_reader_registry.find("file.mcd") is McdFileReader
+    assert file_reader_registry.find("custom.mcd") is McdFileReader
+    assert file_reader_registry.find("file.tiff") is None
+    file_reader_registry.register(_McdFileReader)
+    assert file_reader_registry.find("custom.mcd") is McdFileReader
+    file_reader_registry.register(_McdFileReader, first=True)  # already registered
+    assert file_reader_registry.find("custom.mcd") is McdFileReader
+    file_reader_registry.unregister(_McdFileReader)
+    file_reader_registry.register(_McdFileReader, first=True)
+    assert list(file_reader_registry)[0] is _McdFileReader
+    assert file_reader_registry.find("custom.mcd") is _McdFileReader
+    assert file_reader_registry.find("file.mcd") is McdFileReader
+
+
+def test_file_reader_registry_find_capabilities():
+    file_reader_registry = FileReaderRegistry([_McdFileReader, McdFileReader])
+    assert file_reader_registry.find("custom.mcd") is _McdFileReader
+    assert (
+        file_reader_registry.find(
+            "custom.mcd", capabilities=FileReaderBase.Capability.PANORAMAS
+        )
+        is McdFileReader
+    )
+
+
+def test_file_reader_registry_version():
+    file_reader_registry = FileReaderRegistry()
+    version = file_reader_registry.version
+    file_reader_registry.register(McdFileReader)
+    file_reader_registry.register(McdFileReader)
+    assert file_reader_registry.version == version + 1
+    file_reader_registry.unregister(McdFileReader)
+    assert file_reader_registry.version == version + 2
+    assert len(file_reader_registry) == 0
+
+
+def test_file_reader_registry_register_invalid():
+    with pytest.raises(TypeError):
+        FileReaderRegistry().register(object)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from napari_imc.io import McdFileReader, base
+from napari_imc.io.metadata_index import MetadataIndex
+from napari_imc.io.statistics import (
+    PERCENTILES,
+    compute_channel_statistics,
+    dump_channel_statistics,
+    load_channel_statistics,
+)
+
+
+def test_compute_channel_statistics():
+    rng = np.random.default_rng(0)
+    img = rng.uniform(0.0, 100.0, size=(2, 30, 40)).astype(np.float32)
+    img[1] = 5.0
+    statistics = compute_channel_statistics(img, num_bins=16)
+    assert len(statistics) == 2
+    assert statistics[0].min == float(img[0].min())
+    assert statistics[0].max == float(img[0].max())
+    np.testing.assert_allclose(
+        statistics[0].percentiles, np.percentile(img[0], PERCENTILES)
+    )
+    assert len(statistics[0].histogram) == 16
+    assert sum(statistics[0].histogram) == img[0].size
+    assert statistics[0].histogram[-1] > 0
+    assert statistics[1].min == statistics[1].max == 5.0
+    assert statistics[1].histogram[0] == img[1].size
+    assert statistics[1].get_percentile(50.0) == 5.0
+
+
+def test_compute_channel_statistics_empty():
+    statistics = compute_channel_statistics(np.zeros((3, 0, 0), dtype=np.float32))
+    assert len(statistics) == 3
+    assert all(sum(channel.histogram) == 0 for channel in statistics)
+
+
+def test_dump_load_channel_statistics():
+    img = np.arange(2 * 10 * 10, dtype=np.float32).reshape(2, 10, 10)
+    statistics = compute_channel_statistics(img)
+    assert load_channel_statistics(dump_channel_statistics(statistics)) == statistics
+
+
+def test_read_acquisition_statistics(tmp_path, mcd_file, monkeypatch):
+    metadata_index = MetadataIndex(tmp_path / "metadata.sqlite")
+    with McdFileReader(mcd_file.path, metadata_index=metadata_index) as f:
+        statistics = f.read_acquisition_statistics(1)
+    assert list(statistics.keys()) == ["DNA1", "DNA2", "Marker"]
+    assert statistics["Marker"].max == float(mcd_file.acquisitions[1][2].max())
+    # indexed statistics are not computed again
+    monkeypatch.setattr(base, "compute_channel_statistics", None)
+    with McdFileReader(mcd_file.path, metadata_index=metadata_index) as f:
+        assert f.read_acquisition_statistics(1) == statistics
+    metadata_index.close()
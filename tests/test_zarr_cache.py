@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from napari_imc.io import McdFileReader
+from napari_imc.io.base import ImageDimensions
+
+zarr = pytest.importorskip("zarr")
+
+from napari_imc.io.zarr_cache import ZarrCache  # noqa: E402
+
+DIMS = ImageDimensions(1.0, 2.0, 8.0, 6.0, flip_y=True)
+
+
+def _write_zarr_cache(zarr_cache, mcd_file):
+    with McdFileReader(mcd_file.path) as f:
+        with zarr_cache.create(mcd_file.path) as writer:
+            writer.write_panorama_pyramid(1, *f.read_panorama_pyramid(1))
+            for acquisition_id, img in mcd_file.acquisitions.items():
+                writer.write_acquisition_channels(
+                    acquisition_id, DIMS, iter(img), img.shape[0]
+                )
+
+
+def test_zarr_cache(tmp_path, mcd_file):
+    zarr_cache = ZarrCache(tmp_path / "cache")
+    assert not zarr_cache.contains(mcd_file.path)
+    assert zarr_cache.read_acquisition_stack(mcd_file.path, 1) is None
+    _write_zarr_cache(zarr_cache, mcd_file)
+    assert zarr_cache.contains(mcd_file.path)
+    assert [p.suffix for p in zarr_cache.directory.iterdir()] == [".zarr"]
+    for acquisition_id, img in mcd_file.acquisitions.items():
+        dims, cached_img = zarr_cache.read_acquisition_stack(
+            mcd_file.path, acquisition_id
+        )
+        assert isinstance(cached_img, zarr.Array)
+        assert dims == DIMS
+        assert np.array_equal(cached_img[:], img)
+    dims, levels = zarr_cache.read_panorama_pyramid(mcd_file.path, 1)
+    assert np.array_equal(levels[0][:], mcd_file.panorama)
+    assert zarr_cache.read_panorama_pyramid(mcd_file.path, 2) is None
+
+
+def test_zarr_cache_incomplete(tmp_path, mcd_file):
+    zarr_cache = ZarrCache(tmp_path / "cache")
+    with pytest.raises(IOError):
+        with zarr_cache.create(mcd_file.path) as writer:
+            img = mcd_file.acquisitions[1]
+            writer.write_acquisition_channels(1, DIMS, iter(img), img.shape[0])
+            raise IOError()
+    assert not zarr_cache.contains(mcd_file.path)
+    assert list(zarr_cache.directory.iterdir()) == []
+
+
+def test_zarr_cache_invalidated_on_file_change(tmp_path, mcd_file):
+    zarr_cache = ZarrCache(tmp_path / "cache")
+    _write_zarr_cache(zarr_cache, mcd_file)
+    with mcd_file.path.open("ab") as f:
+        f.write(b"\0")
+    assert not zarr_cache.contains(mcd_file.path)
+
+
+def test_read_acquisition_stack_from_zarr_cache(tmp_path, mcd_file):
+    zarr_cache = ZarrCache(tmp_path / "cache")
+    _write_zarr_cache(zarr_cache, mcd_file)
+    with McdFileReader(mcd_file.path, zarr_cache=zarr_cache) as f:
+        dims, img = f.read_acquisition_stack(2)
+        assert isinstance(img, zarr.Array)
+        assert np.array_equal(img[:], mcd_file.acquisitions[2])
+        dims, levels = f.read_panorama_pyramid(1)
+        assert isinstance(levels[0], zarr.Array)